@@ -12,7 +12,20 @@ DATABASE_URL = (
     f"{os.getenv('MYSQL_DB')}"
 )
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# Size the pool explicitly: the default (5 + 10 overflow) exhausts under a
+# few dozen concurrent requests. pool_recycle stays below MySQL's
+# wait_timeout so idle connections are refreshed before the server drops them.
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=20,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    # LIFO checkout keeps a small hot set of connections busy and lets the
+    # rest idle long enough for pool_recycle to retire them.
+    pool_use_lifo=True,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
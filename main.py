@@ -1,6 +1,6 @@
 from database import engine, Base
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError, HTTPException as FastAPIHTTPException
@@ -29,7 +29,9 @@ from routers import (
 # Auto-create tables (or manage migrations externally)
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="AUCA Alumni")
+# orjson serializes responses (including datetimes/dates) in one C pass,
+# instead of stdlib json plus a jsonable_encoder walk.
+app = FastAPI(title="AUCA Alumni", default_response_class=ORJSONResponse)
 
 # CORS configuration
 origins = [
@@ -0,0 +1,65 @@
+-- Schema changes on top of `auca.sql` for databases provisioned from that
+-- dump. `Base.metadata.create_all` (main.py) only creates missing tables —
+-- it never alters existing ones — so columns and indexes added to
+-- models.py after the dump must be applied with this script:
+--
+--     mysql auca < migrations.sql
+--
+-- Every statement uses IF NOT EXISTS, so the script is safe to re-run.
+
+--
+-- social_activities.photo_sha: sha256 of the uploaded image bytes, used
+-- to skip re-encoding an unchanged photo on update
+--
+
+ALTER TABLE `social_activities`
+  ADD COLUMN IF NOT EXISTS `photo_sha` varchar(64) COLLATE utf8mb4_unicode_ci DEFAULT NULL AFTER `photo`;
+
+--
+-- FULLTEXT indexes backing MATCH ... AGAINST search. Without them MySQL
+-- rejects the query outright (error 1191), so every ?search= request on
+-- these endpoints fails.
+--
+
+ALTER TABLE `opportunity_histories`
+  ADD FULLTEXT INDEX IF NOT EXISTS `ix_opportunity_histories_comment_ft` (`comment`);
+ALTER TABLE `programs`
+  ADD FULLTEXT INDEX IF NOT EXISTS `ix_programs_title_desc_ft` (`title`, `description`);
+ALTER TABLE `social_activities`
+  ADD FULLTEXT INDEX IF NOT EXISTS `ix_social_activities_title_desc_ft` (`title`, `description`);
+ALTER TABLE `students`
+  ADD FULLTEXT INDEX IF NOT EXISTS `ix_students_name_ft` (`first_name`, `last_name`);
+ALTER TABLE `work_experiences`
+  ADD FULLTEXT INDEX IF NOT EXISTS `ix_work_experiences_company_title_ft` (`company`, `job_title`);
+
+--
+-- Composite (created_at, id) indexes serving the keyset cursors
+--
+
+ALTER TABLE `personal_information`
+  ADD INDEX IF NOT EXISTS `ix_personal_information_created_id` (`created_at`, `id`);
+ALTER TABLE `professions`
+  ADD INDEX IF NOT EXISTS `ix_professions_created_id` (`created_at`, `id`);
+ALTER TABLE `sliders`
+  ADD INDEX IF NOT EXISTS `ix_sliders_created_id` (`created_at`, `id`);
+ALTER TABLE `social_activities`
+  ADD INDEX IF NOT EXISTS `ix_social_activities_created_id` (`created_at`, `id`);
+ALTER TABLE `students`
+  ADD INDEX IF NOT EXISTS `ix_students_created_id` (`created_at`, `id`);
+ALTER TABLE `work_experiences`
+  ADD INDEX IF NOT EXISTS `ix_work_experiences_created_id` (`created_at`, `id`);
+
+--
+-- Unique indexes backing the IntegrityError duplicate guards in the add
+-- and update handlers. If one of these fails, the table already contains
+-- duplicates — de-duplicate the rows first, then re-run.
+--
+
+ALTER TABLE `professions`
+  ADD UNIQUE INDEX IF NOT EXISTS `name` (`name`);
+ALTER TABLE `programs`
+  ADD UNIQUE INDEX IF NOT EXISTS `title` (`title`);
+ALTER TABLE `social_activities`
+  ADD UNIQUE INDEX IF NOT EXISTS `ix_social_activities_title_date` (`title`, `date`);
+ALTER TABLE `work_experiences`
+  ADD UNIQUE INDEX IF NOT EXISTS `uq_work_experiences_user_company_start` (`user_id`, `company`, `start_date`);
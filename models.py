@@ -1,5 +1,6 @@
 from database import Base
-from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, Boolean, ForeignKey, func, Numeric
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, Boolean, ForeignKey, func, Numeric, Index
+from sqlalchemy.orm import relationship
 
 class Certifications(Base):
     __tablename__ = "certifications"
@@ -197,6 +198,10 @@ class Opportunities(Base):
 
 class OpportunityHistories(Base):
     __tablename__ = "opportunity_histories"
+    __table_args__ = (
+        # Backs the comment search in list_history (MATCH ... AGAINST)
+        Index("ix_opportunity_histories_comment_ft", "comment", mysql_prefix="FULLTEXT"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     opportunity_id = Column(BigInteger, nullable=False)
@@ -253,6 +258,10 @@ class PersonalAccessTokens(Base):
 
 class PersonalInformation(Base):
     __tablename__ = "personal_information"
+    __table_args__ = (
+        # Serves the (created_at, id) keyset cursor in the list endpoint
+        Index("ix_personal_information_created_id", "created_at", "id"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     photo = Column(String(255), nullable=True)
@@ -285,12 +294,27 @@ class PersonalInformation(Base):
     gender = Column(Boolean, nullable=False)
     status = Column(String(255))
 
+    # user_id carries no FK constraint in the legacy schema, so spell the
+    # join out; viewonly keeps writes going through user_id as before.
+    user = relationship(
+        "Users",
+        primaryjoin="foreign(PersonalInformation.user_id) == Users.id",
+        viewonly=True,
+        uselist=False,
+    )
+
 
 class Professions(Base):
     __tablename__ = "professions"
+    __table_args__ = (
+        # Serves the (created_at, id) keyset cursor in the list endpoint
+        Index("ix_professions_created_id", "created_at", "id"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    name = Column(String(255), nullable=False)
+    # unique so duplicate checks happen in the INSERT itself rather than a
+    # racy SELECT-then-INSERT in the handlers
+    name = Column(String(255), nullable=False, unique=True)
     created_at = Column(
         DateTime,
         nullable=False,
@@ -308,10 +332,15 @@ class Professions(Base):
 
 class Programs(Base):
     __tablename__ = "programs"
+    __table_args__ = (
+        # Backs the search in list_programs (MATCH ... AGAINST)
+        Index("ix_programs_title_desc_ft", "title", "description", mysql_prefix="FULLTEXT"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     photo = Column(String(255), nullable=False)
-    title = Column(String(255), nullable=False)
+    # unique so duplicate checks happen in the INSERT itself
+    title = Column(String(255), nullable=False, unique=True)
     description = Column(String(255), nullable=False)
     created_at = Column(
         DateTime,
@@ -354,6 +383,10 @@ class ProgramAttendances(Base):
 
 class Sliders(Base):
     __tablename__ = "sliders"
+    # Composite key for keyset pagination: seek on (created_at, id)
+    __table_args__ = (
+        Index("ix_sliders_created_id", "created_at", "id"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     photo = Column(String(255))
@@ -375,9 +408,26 @@ class Sliders(Base):
 
 class SocialActivities(Base):
     __tablename__ = "social_activities"
+    # The unique (title, date) pair backs the duplicate guard with an index
+    # seek and enforces it at the DB level; (created_at, id) serves keyset
+    # pagination
+    # FULLTEXT backs MATCH ... AGAINST search over title/description
+    __table_args__ = (
+        Index("ix_social_activities_title_date", "title", "date", unique=True),
+        Index("ix_social_activities_created_id", "created_at", "id"),
+        Index(
+            "ix_social_activities_title_desc_ft",
+            "title",
+            "description",
+            mysql_prefix="FULLTEXT",
+        ),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     photo = Column(String(255), nullable=False)
+    # sha256 of the uploaded bytes; lets updates skip re-encoding an
+    # unchanged image
+    photo_sha = Column(String(64), nullable=True)
     title = Column(String(255), nullable=False)
     description = Column(String(255), nullable=False)
     date = Column(Date, nullable=False)
@@ -398,6 +448,17 @@ class SocialActivities(Base):
 
 class Students(Base):
     __tablename__ = "students"
+    # (created_at, id) serves keyset pagination; FULLTEXT backs
+    # MATCH ... AGAINST name search
+    __table_args__ = (
+        Index("ix_students_created_id", "created_at", "id"),
+        Index(
+            "ix_students_name_ft",
+            "first_name",
+            "last_name",
+            mysql_prefix="FULLTEXT",
+        ),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     id_number = Column(Integer, nullable=False)
@@ -493,6 +554,26 @@ class Users(Base):
 
 class WorkExperiences(Base):
     __tablename__ = "work_experiences"
+    # (created_at, id) serves keyset pagination; FULLTEXT backs
+    # MATCH ... AGAINST search over company/job_title
+    # The unique triple backs the duplicate guard in add/update at the DB
+    # level, so no racy SELECT-then-INSERT
+    __table_args__ = (
+        Index(
+            "uq_work_experiences_user_company_start",
+            "user_id",
+            "company",
+            "start_date",
+            unique=True,
+        ),
+        Index("ix_work_experiences_created_id", "created_at", "id"),
+        Index(
+            "ix_work_experiences_company_title_ft",
+            "company",
+            "job_title",
+            mysql_prefix="FULLTEXT",
+        ),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     company = Column(String(255), nullable=False)
@@ -516,6 +597,14 @@ class WorkExperiences(Base):
     end_date = Column(String(255))
     user_id = Column(Integer)
 
+    # user_id carries no FK in the schema, so spell the join out with
+    # foreign(); viewonly keeps the ORM from trying to manage it
+    user = relationship(
+        "Users",
+        primaryjoin="foreign(WorkExperiences.user_id) == Users.id",
+        viewonly=True,
+    )
+
 class RevokedToken(Base):
     __tablename__ = "revoked_tokens"
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -3,8 +3,10 @@ import random
 import smtplib
 from email.message import EmailMessage
 from fastapi import APIRouter, Depends, HTTPException, status, Body, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import literal, select
+from sqlalchemy.orm import Session, load_only, raiseload
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.encoders import jsonable_encoder
@@ -34,7 +36,13 @@ EMAIL_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_PASS = os.getenv("EMAIL_HOST_PASSWORD")
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Cost factor is env-tunable so dev and test environments can drop below
+# the production default of 12 (~100ms+ per hash) without code changes
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
@@ -73,7 +81,14 @@ def initiate_registration(
     3) Generate 6-digit OTP, store in remember_token.
     4) Email OTP to the user.
     """
-    student = db.query(Students).filter_by(id=data.student_id).first()
+    # Only the name columns are read; raiseload makes any relationship
+    # added later fail loudly here instead of silently lazy-loading
+    student = (
+        db.query(Students)
+        .options(load_only(Students.first_name, Students.last_name), raiseload("*"))
+        .filter_by(id=data.student_id)
+        .first()
+    )
     if not student:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -177,9 +192,27 @@ def complete_registration(
     status_code=status.HTTP_201_CREATED,
     summary="Register a new user linked to a student record",
 )
-def register_user(data: UserRegisterSchema, db: Session = Depends(get_db)):
-    # 1) Verify student exists
-    student = db.query(Students).filter_by(id=data.student_id).first()
+async def register_user(data: UserRegisterSchema, db: Session = Depends(get_db)):
+    # 1+2) Verify student exists and check for duplicates in a single
+    # round-trip: both lookups are UNION ALL'd into one statement, each row
+    # tagged by which check it came from.
+    checks = (
+        select(
+            literal("student").label("kind"),
+            Students.first_name.label("col1"),
+            Students.last_name.label("col2"),
+        ).where(Students.id == data.student_id)
+    ).union_all(
+        select(
+            literal("user").label("kind"),
+            Users.email.label("col1"),
+            Users.email.label("col2"),
+        ).where((Users.email == data.email) | (Users.student_id == data.student_id))
+    )
+    rows = db.execute(checks).all()
+    student = next((r for r in rows if r.kind == "student"), None)
+    existing = next((r for r in rows if r.kind == "user"), None)
+
     if not student:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -187,15 +220,8 @@ def register_user(data: UserRegisterSchema, db: Session = Depends(get_db)):
                 "error": "invalid_student_id",
                 "message": f"No student found with ID {data.student_id}. Please check your Student ID."},
         )
-
-    # 2) Prevent duplicate user for same student or email
-    existing = (
-        db.query(Users)
-        .filter((Users.email == data.email) | (Users.student_id == data.student_id))
-        .first()
-    )
     if existing:
-        if existing.email == data.email:
+        if existing.col1 == data.email:
             code = "email_exists"
             msg = f"Email {data.email} is already registered. Forgot your password?"
         else:
@@ -206,16 +232,17 @@ def register_user(data: UserRegisterSchema, db: Session = Depends(get_db)):
             detail={"error": code, "message": msg},
         )
 
-    # 3) Hash password
-    hashed_pw = pwd_context.hash(data.password)
+    # 3) Hash password — bcrypt burns a few hundred ms of CPU, so hash in
+    # the threadpool and let concurrent registrations proceed
+    hashed_pw = await run_in_threadpool(pwd_context.hash, data.password)
 
     # 4) Create and persist user, using student name
     new_user = Users(
         email=data.email,
         password=hashed_pw,
         student_id=data.student_id,
-        first_name=student.first_name,
-        last_name=student.last_name,
+        first_name=student.col1,
+        last_name=student.col2,
         phone_number=data.phone_number,
     )
     db.add(new_user)
@@ -1,7 +1,7 @@
 import os
-from io import BytesIO
 import datetime
 from typing import Optional
+from urllib.parse import urlencode
 
 from fastapi import (
     APIRouter, Depends, HTTPException,
@@ -97,8 +97,14 @@ def list_certifications(
             )
         )
 
+    path_url = str(request.url.replace(query=""))
+    extra = {
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    }
+
     def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
+        return f"{path_url}?{urlencode({**extra, 'page': p, 'page_size': page_size})}"
 
     return CertificationListResponse(
         total=total,
@@ -125,14 +131,14 @@ async def add_certification(
     image: UploadFile = File(..., description="Certificate image file"),
     db: Session = Depends(get_db),
 ):
-    # 1) Validate payload
+    # 1) Validate payload (the image stays in the spooled upload file;
+    # reading it into a bytes field would hold the whole payload on the heap)
     schema = CreateCertificationSchema(
         user_id=user_id,
         certificate_name=certificate_name,
         year=year,
         type=type,
         description=description,
-        image=await image.read()
     )
 
     # 2) Verify user exists
@@ -154,9 +160,8 @@ async def add_certification(
     filename = f"{slug}_{schema.year}{ext}"
     filepath = os.path.join(UPLOAD_DIR, filename)
 
-    buf = BytesIO(schema.image)
     try:
-        img = Image.open(buf).convert("RGB").resize((1270, 720), Image.LANCZOS)
+        img = Image.open(image.file).convert("RGB").resize((1270, 720), Image.LANCZOS)
         img.save(filepath, quality=85)
     except UnidentifiedImageError:
         raise HTTPException(status_code=400, detail="Invalid image file")
@@ -237,14 +242,13 @@ async def update_certification(
     if not cert:
         raise HTTPException(status_code=404, detail="Certification not found")
 
-    # 1) Validate payload
+    # 1) Validate payload (image, when present, stays in the spooled upload)
     schema = CreateCertificationSchema(
         user_id=user_id,
         certificate_name=certificate_name,
         year=year,
         type=type,
         description=description,
-        image=(await image.read()) if image else b""
     )
 
     # 2) Verify user
@@ -277,9 +281,8 @@ async def update_certification(
         slug = "_".join(schema.certificate_name.lower().split())
         filename = f"{slug}_{schema.year}{ext}"
         fp = os.path.join(UPLOAD_DIR, filename)
-        buf = BytesIO(schema.image)
         try:
-            img = Image.open(buf).convert("RGB").resize((1270, 720), Image.LANCZOS)
+            img = Image.open(image.file).convert("RGB").resize((1270, 720), Image.LANCZOS)
             img.save(fp, quality=85)
         except UnidentifiedImageError:
             raise HTTPException(status_code=400, detail="Invalid image file")
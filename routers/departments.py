@@ -1,4 +1,5 @@
 from typing import Optional
+from urllib.parse import urlencode
 import os
 import datetime
 
@@ -74,8 +75,14 @@ def list_departments(
             )
         )
 
+    path_url = str(request.url.replace(query=""))
+    extra = {
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    }
+
     def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
+        return f"{path_url}?{urlencode({**extra, 'page': p, 'page_size': page_size})}"
 
     return DepartmentListResponse(
         total=total,
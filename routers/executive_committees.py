@@ -2,6 +2,7 @@ import os
 from io import BytesIO
 import datetime
 from typing import Optional
+from urllib.parse import urlencode
 
 from fastapi import (
     APIRouter, Depends, HTTPException,
@@ -80,8 +81,14 @@ def list_committees(
         for member in raw
     ]
 
+    path_url = str(request.url.replace(query=""))
+    extra = {
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    }
+
     def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
+        return f"{path_url}?{urlencode({**extra, 'page': p, 'page_size': page_size})}"
 
     return ExecutiveCommitteeListResponse(
         total=total,
@@ -1,6 +1,7 @@
 import os
 import datetime
 from typing import Optional
+from urllib.parse import urlencode
 from PIL import Image
 
 from fastapi import (
@@ -106,8 +107,14 @@ def getNews(
         )
 
     # 6) Navigation URLs
+    path_url = str(request.url.replace(query=""))
+    extra = {
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    }
+
     def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
+        return f"{path_url}?{urlencode({**extra, 'page': p, 'page_size': page_size})}"
 
     prev_page = make_url(page - 1) if page > 1 else None
     next_page = make_url(page + 1) if offset + len(items) < total else None
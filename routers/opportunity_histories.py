@@ -1,5 +1,6 @@
 import datetime
-from typing import Optional
+from typing import List, Optional
+from urllib.parse import urlencode
 
 from fastapi import (
     APIRouter,
@@ -13,7 +14,7 @@ from fastapi import (
 )
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc, func
+from sqlalchemy import asc, desc, func, insert
 
 from database import get_db
 from models import OpportunityHistories, Users, Opportunities
@@ -59,8 +60,9 @@ def list_history(
     # 2) Base query + optional search
     q = db.query(OpportunityHistories)
     if search:
-        term = f"%{search.strip()}%"
-        q = q.filter(OpportunityHistories.comment.ilike(term))
+        # Uses the FULLTEXT index on `comment` instead of a leading-wildcard
+        # ILIKE, which cannot be served by any index and scans the table.
+        q = q.filter(OpportunityHistories.comment.match(search.strip()))
 
     # 3) Ordering
     direction = asc if order == "asc" else desc
@@ -72,30 +74,49 @@ def list_history(
     if not raw and page != 1:
         raise HTTPException(status_code=404, detail="Page out of range")
 
-    # 5) Build items
-    base = str(request.base_url).rstrip("/")
+    # 5) Build items — memoize the nested schemas per id so an opportunity
+    # (or user) appearing on many history rows is validated only once.
+    user_cache = {}
+    opp_cache = {}
     items = []
     for h in raw:
-        user = db.query(Users).get(h.user_id)
-        opp = db.query(Opportunities).get(h.opportunity_id)
-        if not user or not opp:
-            raise HTTPException(
-                status_code=404,
-                detail="Related user or opportunity not found"
-            )
+        user_schema = user_cache.get(h.user_id)
+        if user_schema is None:
+            user = db.query(Users).get(h.user_id)
+            if not user:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Related user or opportunity not found"
+                )
+            user_cache[h.user_id] = user_schema = OpportunityUserSchema.model_validate(user)
+        opp_schema = opp_cache.get(h.opportunity_id)
+        if opp_schema is None:
+            opp = db.query(Opportunities).get(h.opportunity_id)
+            if not opp:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Related user or opportunity not found"
+                )
+            opp_cache[h.opportunity_id] = opp_schema = OpportunitySummarySchema.model_validate(opp)
         items.append(
             OpportunityHistorySchema(
                 **{
                     **h.__dict__,
-                    "user": OpportunityUserSchema.model_validate(user),
-                    "opportunity": OpportunitySummarySchema.model_validate(opp),
+                    "user": user_schema,
+                    "opportunity": opp_schema,
                 }
             )
         )
 
     # 6) Navigation URLs
+    path_url = str(request.url.replace(query=""))
+    extra = {
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    }
+
     def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
+        return f"{path_url}?{urlencode({**extra, 'page': p, 'page_size': page_size})}"
 
     prev_page = make_url(page - 1) if page > 1 else None
     next_page = make_url(page + 1) if offset + len(items) < total else None
@@ -155,6 +176,51 @@ def add_history(
         }
     )
 
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many opportunity history entries in a single request",
+)
+def add_histories_bulk(
+    items: List[CreateOpportunityHistorySchema] = Body(...),
+    db: Session = Depends(get_db),
+):
+    """
+    1) Validate every item via CreateOpportunityHistorySchema
+    2) Verify all referenced opportunities & users with two IN() lookups
+    3) Persist the whole batch with one executemany INSERT (single commit)
+    """
+    if not items:
+        raise HTTPException(status_code=400, detail="No history entries provided")
+
+    # 2) Check related records in bulk instead of per-row round-trips
+    opp_ids = {i.opportunity_id for i in items}
+    user_ids = {i.user_id for i in items}
+    found_opps = {
+        row[0]
+        for row in db.query(Opportunities.id).filter(Opportunities.id.in_(opp_ids)).all()
+    }
+    missing_opps = opp_ids - found_opps
+    if missing_opps:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Opportunities not found: {sorted(missing_opps)}",
+        )
+    found_users = {
+        row[0] for row in db.query(Users.id).filter(Users.id.in_(user_ids)).all()
+    }
+    missing_users = user_ids - found_users
+    if missing_users:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Users not found: {sorted(missing_users)}",
+        )
+
+    # 3) One bulk INSERT, one commit
+    db.execute(insert(OpportunityHistories), [i.model_dump() for i in items])
+    db.commit()
+    return {"status": "success", "created": len(items)}
+
 @router.get(
     "/{hist_id}",
     response_model=OpportunityHistorySchema,
@@ -1,15 +1,21 @@
+import asyncio
+import base64
 import os
 import datetime
 from io import BytesIO
-from typing import Optional
+from pathlib import Path
+from urllib.parse import urlencode
+from typing import List, Optional
+
+from pydantic import TypeAdapter
 
 from fastapi import (
     APIRouter, Depends, HTTPException, status,
     UploadFile, File, Form, Request, Query
 )
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc, func
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import asc, desc, func, select, tuple_
 from PIL import Image, UnidentifiedImageError
 
 from database import get_db
@@ -19,26 +25,103 @@ from schemas.personal_information import (
     PersonalInformationSchema,
     PersonalInformationListResponse
 )
+from schemas.auth import UserResponseSchema
 from routers.auth import get_current_user
+from utils.images import run_image_task
 from fastapi.encoders import jsonable_encoder
 
 router = APIRouter(
     prefix="/personal-information",
     tags=["personal-information"],
     dependencies=[Depends(get_current_user)],
+    default_response_class=ORJSONResponse,
 )
 
-# Directory for uploads
-UPLOAD_DIR = os.path.join(os.getcwd(), "uploads", "personal_information")
+# Directory for uploads — resolved once at import so request handlers
+# never re-run getcwd()/join
+UPLOAD_ROOT = Path(os.getcwd()).resolve()
+UPLOAD_DIR = os.path.join(UPLOAD_ROOT, "uploads", "personal_information")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
+def _stored_photo_path(photo: str) -> Path:
+    """Map a stored /uploads/... value to its on-disk path.
+
+    Resolves and checks containment so a tampered DB value can never point
+    the unlink outside the project tree.
+    """
+    resolved = (UPLOAD_ROOT / photo.lstrip("/")).resolve()
+    try:
+        resolved.relative_to(UPLOAD_ROOT)
+    except ValueError:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid photo path")
+    return resolved
+
+
+# Compiled once at import; validates and dumps a whole page of rows in a
+# single call instead of per-row model __init__.
+_PI_LIST_ADAPTER = TypeAdapter(List[PersonalInformationSchema])
+
+# Sort whitelists, indexed directly instead of getattr + branch per request
+_SORT_COLUMNS = {
+    "id": PersonalInformation.id,
+    "created_at": PersonalInformation.created_at,
+}
+_DIRECTION = {"asc": asc, "desc": desc}
+
+
+def _decode_cursor(cursor: str):
+    """Decode a base64 "created_at:id" keyset cursor; 400 on garbage."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        ts, _, last_id = raw.rpartition(":")
+        return datetime.datetime.fromisoformat(ts), int(last_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+
+
+def _encode_cursor(row) -> str:
+    return base64.urlsafe_b64encode(
+        f"{row.created_at.isoformat()}:{row.id}".encode()
+    ).decode()
+
+
+def _decode_and_resize(buffer):
+    """Decode and downscale to 1270x720; CPU-bound, run via the image pool."""
+    img = Image.open(buffer)
+    # draft decodes at a reduced DCT scale inside libjpeg (near-free),
+    # BOX gets within 2x cheaply, and one LANCZOS pass finishes the job
+    img.draft("RGB", (2540, 1440))
+    img = img.convert("RGB")
+    img.thumbnail((2540, 1440), Image.BOX)
+    return img.resize((1270, 720), Image.LANCZOS)
+
+
+def _encode_and_write(img, path: str) -> None:
+    """JPEG-encode into one buffer, then write it with a single write(2).
+
+    The whole JPEG lands in memory first, so a raw fd and a single
+    os.write keep the disk step to open/write/close instead of the
+    buffered-file path.
+    """
+    out = BytesIO()
+    img.save(out, format="JPEG", quality=85)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, out.getbuffer())
+    finally:
+        os.close(fd)
+
+
 # ------------------------------------------------------------------------
 # GET /personal-information: list all with pagination
 # ------------------------------------------------------------------------
 @router.get(
     "/",
-    response_model=PersonalInformationListResponse,
+    # response_model would re-validate what the adapter just validated;
+    # keep the schema in OpenAPI via `responses` instead
+    response_model=None,
+    responses={200: {"model": PersonalInformationListResponse}},
     summary="Retrieve paginated personal information records with nested user data",
 )
 def list_personal_information(
@@ -49,64 +132,111 @@ def list_personal_information(
     page_size: int = Query(10, ge=1, le=100),
     sort_by: str = Query("created_at", regex="^(id|created_at)$"),
     order: str = Query("desc", regex="^(asc|desc)$"),
-) -> PersonalInformationListResponse:
-    # 1) total count
-    total = db.query(func.count(PersonalInformation.id)).scalar()
-
-    # 2) base query
-    query = db.query(PersonalInformation)
-
-    # 3) ordering
-    direction = asc if order == "asc" else desc
-    query = query.order_by(direction(getattr(PersonalInformation, sort_by)))
-
-    # 4) pagination
-    offset = (page - 1) * page_size
-    raws = query.offset(offset).limit(page_size).all()
-    if not raws and page != 1:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "Page out of range")
-
-    # 5) build items
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from next_cursor; overrides page and "
+                    "pins the sort to (created_at, id)",
+    ),
+):
+    # 1) single query: page rows plus COUNT(*) OVER () so the total rides
+    # along in the same scan instead of a separate SELECT COUNT(*);
+    # eager-load the user so the item loop issues no per-row SELECTs
+    query = db.query(
+        PersonalInformation, func.count().over().label("total")
+    ).options(joinedload(PersonalInformation.user))
+
+    # 2-3) ordering + pagination. With a cursor, seek past the last-seen
+    # (created_at, id) through the composite index instead of making the DB
+    # count and discard OFFSET rows; otherwise keep the legacy page path.
+    direction = _DIRECTION[order]
+    if cursor is not None:
+        last_created, last_id = _decode_cursor(cursor)
+        key = tuple_(PersonalInformation.created_at, PersonalInformation.id)
+        query = query.filter(
+            key > (last_created, last_id)
+            if order == "asc"
+            else key < (last_created, last_id)
+        ).order_by(
+            direction(PersonalInformation.created_at),
+            direction(PersonalInformation.id),
+        )
+        offset = 0
+        rows = query.limit(page_size).all()
+    else:
+        # id tiebreaker: created_at has second precision, so ties are routine
+        # and the keyset cursor needs a total order to resume from
+        query = query.order_by(
+            direction(_SORT_COLUMNS[sort_by]), direction(PersonalInformation.id)
+        )
+        offset = (page - 1) * page_size
+        rows = query.offset(offset).limit(page_size).all()
+        if not rows and page != 1:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Page out of range")
+
+    # 4) total comes back on every row of the window; 0 when the page is empty
+    total = rows[0].total if rows else 0
+    raws = [row[0] for row in rows]
+
+    # 5) build items — rows come straight from the DB, already typed by the
+    # ORM, so model_construct skips re-validating every field; the adapter
+    # then dumps the whole page in one call
     base = str(request.base_url).rstrip("/")
-    items = []
-    for pi in raws:
-        user = db.query(Users).get(pi.user_id)
-        photo_url = f"{base}{pi.photo}"
-        items.append(
-            PersonalInformationSchema(
-                id=pi.id,
-                photo=photo_url,
-                bio=pi.bio,
-                current_employer=pi.current_employer,
-                self_employed=pi.self_employed,
-                latest_education_level=pi.latest_education_level,
-                address=pi.address,
-                profession_id=pi.profession_id,
-                user=user,
-                dob=pi.dob,
-                start_date=pi.start_date,
-                end_date=pi.end_date,
-                faculty_id=pi.faculty_id,
-                country_id=pi.country_id,
-                department=pi.department,
-                gender=pi.gender,
-                status=pi.status,
-                created_at=pi.created_at,
-                updated_at=pi.updated_at,
-            )
+    schemas = [
+        PersonalInformationSchema.model_construct(
+            id=pi.id,
+            photo=f"{base}{pi.photo}",
+            bio=pi.bio,
+            current_employer=pi.current_employer,
+            self_employed=pi.self_employed,
+            latest_education_level=pi.latest_education_level,
+            address=pi.address,
+            profession_id=pi.profession_id,
+            user=UserResponseSchema.model_construct(
+                id=pi.user.id,
+                email=pi.user.email,
+                student_id=pi.user.student_id,
+                first_name=pi.user.first_name,
+                last_name=pi.user.last_name,
+                phone_number=pi.user.phone_number,
+            ),
+            dob=pi.dob,
+            start_date=pi.start_date,
+            end_date=pi.end_date,
+            faculty_id=pi.faculty_id,
+            country_id=pi.country_id,
+            department=pi.department,
+            gender=pi.gender,
+            status=pi.status,
+            created_at=pi.created_at,
+            updated_at=pi.updated_at,
         )
+        for pi in raws
+    ]
+    items = _PI_LIST_ADAPTER.dump_python(schemas, mode="json")
+
+    # Render the URL once and only vary the query string; include_query_params
+    # would re-parse and re-render the whole URL for next and prev
+    path_url = str(request.url.replace(query=""))
+    extra = {
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    }
 
     def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
-
-    return PersonalInformationListResponse(
-        total=total,
-        page=page,
-        page_size=page_size,
-        next_page=make_url(page + 1) if offset + len(items) < total else None,
-        prev_page=make_url(page - 1) if page > 1 else None,
-        items=items,
-    )
+        return f"{path_url}?{urlencode({**extra, 'page': p, 'page_size': page_size})}"
+
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "next_page": make_url(page + 1) if offset + len(items) < total else None,
+        "prev_page": make_url(page - 1) if page > 1 else None,
+        # only meaningful when the page ordering matches the keyset key
+        "next_cursor": _encode_cursor(raws[-1])
+        if len(raws) == page_size and (cursor is not None or sort_by == "created_at")
+        else None,
+        "items": items,
+    }
 
 # ------------------------------------------------------------------------
 # POST /personal-information/add: create new personal info with photo
@@ -161,28 +291,33 @@ async def add_personal_information(
         status=status_info,
     )
 
-    # 2) Verify user exists
-    user = db.query(Users).get(data.user_id)
-    if not user:
+    # 2) Verify user exists — fetch only the columns the nested schema
+    # needs instead of hydrating the full ORM row
+    user_row = db.execute(
+        select(
+            Users.id, Users.email, Users.student_id,
+            Users.first_name, Users.last_name, Users.phone_number,
+        ).where(Users.id == data.user_id)
+    ).first()
+    if user_row is None:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid user_id")
+    user_schema = UserResponseSchema.model_construct(**user_row._mapping)
 
     # 3) Build filename
     slug = f"user_{data.user_id}_{int(datetime.datetime.utcnow().timestamp())}"
-    ext = os.path.splitext(photo.filename)[1] or ".jpg"
-    filename = f"{slug}{ext}"
+    filename = f"{slug}.jpg"
     filepath = os.path.join(UPLOAD_DIR, filename)
 
-    # 4) Read & crop in-memory
-    contents = await photo.read()
-    buf = BytesIO(contents)
+    # 4) Decode & crop on the image pool — the whole Pillow pipeline is
+    # CPU-bound and would otherwise stall the event loop; the spooled
+    # upload file goes to the decoder directly, no bytes + BytesIO copy
     try:
-        img = Image.open(buf)
-        img = img.convert("RGB")
-        img = img.resize((1270, 720), Image.LANCZOS)
+        img = await run_image_task(_decode_and_resize, photo.file)
     except UnidentifiedImageError:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid image upload")
 
-    img.save(filepath, quality=85)
+    # Encode + single-syscall write off the loop too.
+    await run_image_task(_encode_and_write, img, filepath)
 
     # 5) Persist
     pi = PersonalInformation(
@@ -218,7 +353,7 @@ async def add_personal_information(
         latest_education_level=pi.latest_education_level,
         address=pi.address,
         profession_id=pi.profession_id,
-        user=user,
+        user=user_schema,
         dob=pi.dob,
         start_date=pi.start_date,
         end_date=pi.end_date,
@@ -230,17 +365,13 @@ async def add_personal_information(
         created_at=pi.created_at,
         updated_at=pi.updated_at,
     )
-    profile_dict = schema.model_dump(mode="json")
-
-    # 7) Return success JSON
-    return JSONResponse(
-        status_code=status.HTTP_201_CREATED,
-        content={
-            "status": "success",
-            "message": "Personal information created successfully.",
-            "profile": profile_dict,
-        },
-    )
+    # 7) Return the envelope directly; FastAPI serializes the nested schema
+    # in a single orjson pass (status 201 comes from the route decorator).
+    return {
+        "status": "success",
+        "message": "Personal information created successfully.",
+        "profile": schema,
+    }
 
 # ------------------------------------------------------------------------
 # PUT /personal-information/{id}/update: update a personal info record
@@ -295,10 +426,16 @@ async def update_personal_information(
         status=status,
     )
 
-    # 3) Verify user exists
-    user = db.query(Users).get(data.user_id)
-    if not user:
+    # 3) Verify user exists — columns only, no full-row hydration
+    user_row = db.execute(
+        select(
+            Users.id, Users.email, Users.student_id,
+            Users.first_name, Users.last_name, Users.phone_number,
+        ).where(Users.id == data.user_id)
+    ).first()
+    if user_row is None:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid user_id")
+    user_schema = UserResponseSchema.model_construct(**user_row._mapping)
 
     # 4) Update fields
     for field in ["bio","current_employer","self_employed","latest_education_level",
@@ -308,16 +445,14 @@ async def update_personal_information(
 
     # 5) Optional photo replacement
     if photo:
-        # remove old
-        old = os.path.join(os.getcwd(), pi.photo.lstrip("/"))
-        if os.path.isfile(old): os.remove(old)
+        # remove old — stat and unlink are disk I/O, keep them off the loop
+        old = _stored_photo_path(pi.photo)
+        if await asyncio.to_thread(old.is_file):
+            await asyncio.to_thread(old.unlink)
 
-        contents = await photo.read()
-        buf = BytesIO(contents)
+        # decode + resize on the image pool, not inline on the event loop
         try:
-            img = Image.open(buf)
-            img = img.convert("RGB")
-            img = img.resize((1270,720), Image.LANCZOS)
+            img = await run_image_task(_decode_and_resize, photo.file)
         except UnidentifiedImageError:
             raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid image")
 
@@ -325,13 +460,14 @@ async def update_personal_information(
         ext = os.path.splitext(photo.filename)[1] or ".jpg"
         fn = f"{slug}{ext}"
         path = os.path.join(UPLOAD_DIR, fn)
-        img.save(path, quality=85)
+        # encode + write on the image pool so the JPEG encode does not
+        # block other requests
+        await run_image_task(img.save, path, quality=85)
         pi.photo = f"/uploads/personal_information/{fn}"
 
-    # 6) Commit
-    db.add(pi)
+    # 6) Commit — pi is already persistent, so no add(); skip the explicit
+    # refresh and let attribute access pull the row back lazily if needed
     db.commit()
-    db.refresh(pi)
 
     base = str(request.base_url).rstrip("/")
     return PersonalInformationSchema(
@@ -343,7 +479,7 @@ async def update_personal_information(
         latest_education_level=pi.latest_education_level,
         address=pi.address,
         profession_id=pi.profession_id,
-        user=user,
+        user=user_schema,
         dob=pi.dob,
         start_date=pi.start_date,
         end_date=pi.end_date,
@@ -368,16 +504,26 @@ def delete_personal_information(
     pi_id: int,
     db: Session = Depends(get_db),
 ):
-    pi = db.query(PersonalInformation).get(pi_id)
-    if not pi:
+    # MySQL has no DELETE ... RETURNING, so fetch just the photo column and
+    # issue a criteria delete — no full-row hydration, two statements total
+    row = (
+        db.query(PersonalInformation.photo)
+        .filter(PersonalInformation.id == pi_id)
+        .first()
+    )
+    if row is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Profile not found")
 
-    # remove photo
-    path = os.path.join(os.getcwd(), pi.photo.lstrip("/"))
-    if os.path.isfile(path):
-        try: os.remove(path)
-        except: pass
-
-    db.delete(pi)
+    db.query(PersonalInformation).filter(
+        PersonalInformation.id == pi_id
+    ).delete(synchronize_session=False)
     db.commit()
-    return JSONResponse({"status": "success", "message": f"Profile {pi_id} deleted."})
+
+    # remove photo only after the row is gone
+    if row.photo:
+        path = _stored_photo_path(row.photo)
+        if path.is_file():
+            try: path.unlink()
+            except: pass
+
+    return ORJSONResponse({"status": "success", "message": f"Profile {pi_id} deleted."})
@@ -1,3 +1,6 @@
+import base64
+import datetime
+
 from fastapi import (
     APIRouter,
     Depends,
@@ -5,14 +8,15 @@ from fastapi import (
     status,
     Request,
     Query,
-    Body,
     Form,
 )
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc, func
-from typing import Optional
-from fastapi.encoders import jsonable_encoder
+from sqlalchemy import asc, desc, func, tuple_
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from urllib.parse import urlencode
+from pydantic import TypeAdapter
 
 from database import get_db
 from models import Professions
@@ -27,11 +31,43 @@ router = APIRouter(
     prefix="/professions",
     tags=["professions"],
     dependencies=[Depends(get_current_user)],
+    default_response_class=ORJSONResponse,
 )
 
+# Compiled once at import; validates and dumps a whole page in one call.
+_PROF_LIST_ADAPTER = TypeAdapter(List[ProfessionSchema])
+
+# The Query regexes already restrict values to these keys; index the
+# whitelists directly instead of getattr + branch per request.
+_SORT_COLUMNS = {
+    "id": Professions.id,
+    "name": Professions.name,
+    "created_at": Professions.created_at,
+}
+_DIRECTION = {"asc": asc, "desc": desc}
+
+
+def _decode_cursor(cursor: str):
+    """Decode a base64 "created_at:id" keyset cursor; 400 on garbage."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        ts, _, last_id = raw.rpartition(":")
+        return datetime.datetime.fromisoformat(ts), int(last_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+
+
+def _encode_cursor(row) -> str:
+    return base64.urlsafe_b64encode(
+        f"{row.created_at.isoformat()}:{row.id}".encode()
+    ).decode()
+
 @router.get(
     "/",
-    response_model=ProfessionListResponse,
+    # response_model would re-validate what the adapter just validated;
+    # keep the schema in OpenAPI via `responses` instead
+    response_model=None,
+    responses={200: {"model": ProfessionListResponse}},
     summary="Retrieve a paginated list of professions",
 )
 def list_professions(
@@ -50,42 +86,84 @@ def list_professions(
         regex="^(asc|desc)$",
         description="Sort direction",
     ),
-) -> ProfessionListResponse:
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from next_cursor; overrides page and "
+                    "pins the sort to (created_at, id)",
+    ),
+):
     """
     List professions with pagination and optional name search.
     """
-    total = db.query(func.count(Professions.id)).scalar()
-    query = db.query(Professions)
+    # One query: page rows plus COUNT(*) OVER () as total, so the count is
+    # computed in the same scan instead of a separate SELECT COUNT(*).
+    query = db.query(Professions, func.count().over().label("total"))
     if search:
         term = f"%{search.strip()}%"
         query = query.filter(Professions.name.ilike(term))
 
-    direction = asc if order == "asc" else desc
-    column = getattr(Professions, sort_by)
-    query = query.order_by(direction(column))
+    # With a cursor, seek past the last-seen (created_at, id) through the
+    # composite index instead of counting and discarding OFFSET rows.
+    direction = _DIRECTION[order]
+    if cursor is not None:
+        last_created, last_id = _decode_cursor(cursor)
+        key = tuple_(Professions.created_at, Professions.id)
+        query = query.filter(
+            key > (last_created, last_id)
+            if order == "asc"
+            else key < (last_created, last_id)
+        ).order_by(direction(Professions.created_at), direction(Professions.id))
+        offset = 0
+        rows = query.limit(page_size).all()
+    else:
+        # id tiebreaker: created_at has second precision, so ties are routine
+        # and the keyset cursor needs a total order to resume from
+        query = query.order_by(direction(_SORT_COLUMNS[sort_by]), direction(Professions.id))
+        offset = (page - 1) * page_size
+        rows = query.offset(offset).limit(page_size).all()
+        if not rows and page != 1:
+            raise HTTPException(status_code=404, detail="Page out of range")
+
+    total = rows[0].total if rows else 0
 
-    offset = (page - 1) * page_size
-    raw_items = query.offset(offset).limit(page_size).all()
-    if not raw_items and page != 1:
-        raise HTTPException(status_code=404, detail="Page out of range")
+    # Rows are DB-typed already; model_construct skips field re-validation
+    # and the adapter dumps the page in one call
+    schemas = [
+        ProfessionSchema.model_construct(
+            id=row[0].id,
+            name=row[0].name,
+            created_at=row[0].created_at,
+            updated_at=row[0].updated_at,
+        )
+        for row in rows
+    ]
+    items = _PROF_LIST_ADAPTER.dump_python(schemas, mode="json")
 
-    # Use model_validate() instead of from_attributes()
-    items = [ProfessionSchema.model_validate(prof) for prof in raw_items]
+    # Render the URL once and only vary the query string for next/prev
+    path_url = str(request.url.replace(query=""))
+    extra = {
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    }
 
     def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
+        return f"{path_url}?{urlencode({**extra, 'page': p, 'page_size': page_size})}"
 
     prev_page = make_url(page - 1) if page > 1 else None
     next_page = make_url(page + 1) if offset + len(items) < total else None
 
-    return ProfessionListResponse(
-        total=total,
-        page=page,
-        page_size=page_size,
-        next_page=next_page,
-        prev_page=prev_page,
-        items=items,
-    )
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "next_page": next_page,
+        "prev_page": prev_page,
+        # only meaningful when the page ordering matches the keyset key
+        "next_cursor": _encode_cursor(rows[-1][0])
+        if len(rows) == page_size and (cursor is not None or sort_by == "created_at")
+        else None,
+        "items": items,
+    }
 
 @router.post(
     "/add",
@@ -103,8 +181,14 @@ def add_profession(
     data = CreateProfessionSchema(name=name)
     clean_name = data.name
 
-    # 2) Duplicate check
-    if db.query(Professions).filter_by(name=clean_name).first():
+    # 2) Persist — the unique index on name is the duplicate check, so no
+    # racy SELECT-then-INSERT
+    new_prof = Professions(name=clean_name)
+    db.add(new_prof)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
@@ -112,23 +196,17 @@ def add_profession(
                 "message": f"Profession '{clean_name}' already exists."
             },
         )
-
-    # 3) Persist
-    new_prof = Professions(name=clean_name)
-    db.add(new_prof)
-    db.commit()
     db.refresh(new_prof)
 
-    # 4) Build response
-    envelope = {
-        "status": "success",
-        "message": "Profession created successfully.",
-        "profession": ProfessionSchema.model_validate(new_prof)
-    }
-
-    return JSONResponse(
+    # 4) Build response — dump the schema directly instead of sending the
+    # envelope through jsonable_encoder's per-field walk
+    return ORJSONResponse(
         status_code=status.HTTP_201_CREATED,
-        content=jsonable_encoder(envelope),
+        content={
+            "status": "success",
+            "message": "Profession created successfully.",
+            "profession": ProfessionSchema.model_validate(new_prof).model_dump(mode="json"),
+        },
     )
 
 @router.get(
@@ -172,19 +250,16 @@ def update_profession(
     data = CreateProfessionSchema(name=name)
     new_name = data.name
 
-    # Prevent duplicate
-    if (
-        db.query(Professions)
-        .filter(Professions.id != profession_id, Professions.name == new_name)
-        .first()
-    ):
+    # The unique index on name rejects duplicates at commit time
+    prof.name = new_name
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={"error": "profession_exists", "message": f"Another profession named '{new_name}' exists."},
         )
-
-    prof.name = new_name
-    db.commit()
     db.refresh(prof)
 
     # Return updated schema
@@ -211,7 +286,7 @@ def delete_profession(
 
     db.delete(prof)
     db.commit()
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_200_OK,
         content={"status": "success", "message": f"Profession ID {profession_id} deleted successfully."},
     )
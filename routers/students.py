@@ -1,14 +1,35 @@
+import base64
+import datetime
 from typing import List, Optional
+from urllib.parse import urlencode
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlalchemy import asc, desc, func
+from sqlalchemy import asc, desc, func, select, tuple_
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.orm import Session
 
 from database import get_db
 from models import Students
 from schemas.student import StudentSchema, StudentListResponse
+from utils.cache import get_cached
 
 router = APIRouter()
 
+
+def _decode_cursor(cursor: str):
+    """Decode a base64 "created_at:id" keyset cursor; 400 on garbage."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        ts, _, last_id = raw.rpartition(":")
+        return datetime.datetime.fromisoformat(ts), int(last_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _encode_cursor(row) -> str:
+    return base64.urlsafe_b64encode(
+        f"{row.created_at.isoformat()}:{row.id}".encode()
+    ).decode()
+
 @router.get(
     "/students",
     response_model=StudentListResponse,
@@ -29,6 +50,11 @@ def get_students(
     order: str = Query(
         "desc", regex="^(asc|desc)$", description="Sort direction"
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from next_cursor; overrides page and "
+                    "pins the sort to (created_at, id)",
+    ),
 ) -> StudentListResponse:
     """
     Retrieve students with:
@@ -36,32 +62,63 @@ def get_students(
     - current page and page_size
     - next_page and prev_page as full URLs
     """
-    # 1) Total records (no filter)
-    total = db.query(func.count(Students.id)).scalar()
+    # 1) Shared filter list; the count reuses it through a bare
+    # select(func.count()) with no ordering or column list, so the DB can
+    # answer it from an index alone
+    filters = []
+    if search:
+        # MATCH ... AGAINST over the FULLTEXT index instead of a pair of
+        # leading-wildcard ILIKEs, which can never use an index
+        filters.append(
+            match(Students.first_name, Students.last_name, against=search.strip())
+        )
+    total = get_cached(
+        f"students:total:{(search or '').strip().lower()}",
+        30,
+        lambda: db.execute(
+            select(func.count()).select_from(Students).where(*filters)
+        ).scalar(),
+    )
 
     # 2) Build filtered + ordered query for items
     query = db.query(Students)
-    if search:
-        term = f"%{search.strip()}%"
-        query = query.filter(
-            Students.first_name.ilike(term) | Students.last_name.ilike(term)
-        )
+    if filters:
+        query = query.filter(*filters)
 
+    # 3) Ordering and pagination. With a cursor, seek past the last-seen
+    # (created_at, id) through the composite index instead of counting and
+    # discarding OFFSET rows.
     direction = asc if order == "asc" else desc
-    column = getattr(Students, sort_by)
-    query = query.order_by(direction(column))
-
-    # 3) Pagination
-    offset = (page - 1) * page_size
-    items = query.offset(offset).limit(page_size).all()
+    if cursor is not None:
+        last_created, last_id = _decode_cursor(cursor)
+        key = tuple_(Students.created_at, Students.id)
+        query = query.filter(
+            key > (last_created, last_id)
+            if order == "asc"
+            else key < (last_created, last_id)
+        ).order_by(direction(Students.created_at), direction(Students.id))
+        offset = 0
+        items = query.limit(page_size).all()
+    else:
+        # id tiebreaker: created_at has second precision, so ties are routine
+        # and the keyset cursor needs a total order to resume from
+        query = query.order_by(direction(getattr(Students, sort_by)), direction(Students.id))
+        offset = (page - 1) * page_size
+        items = query.offset(offset).limit(page_size).all()
 
-    # if out of range
-    if not items and page != 1:
-        raise HTTPException(status_code=404, detail="Page out of range")
+        # if out of range
+        if not items and page != 1:
+            raise HTTPException(status_code=404, detail="Page out of range")
 
     # 4) Build navigation URLs
+    path_url = str(request.url.replace(query=""))
+    extra = {
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    }
+
     def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
+        return f"{path_url}?{urlencode({**extra, 'page': p, 'page_size': page_size})}"
 
     prev_page = make_url(page - 1) if page > 1 else None
     next_page = make_url(page + 1) if offset + len(items) < total else None
@@ -72,5 +129,9 @@ def get_students(
         page_size=page_size,
         next_page=next_page,
         prev_page=prev_page,
+        # only meaningful when the page ordering matches the keyset key
+        next_cursor=_encode_cursor(items[-1])
+        if len(items) == page_size and (cursor is not None or sort_by == "created_at")
+        else None,
         items=items,
     )
\ No newline at end of file
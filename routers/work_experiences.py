@@ -1,5 +1,7 @@
+import base64
 import datetime
 from typing import Optional
+from urllib.parse import urlencode
 
 from fastapi import (
     APIRouter,
@@ -10,8 +12,10 @@ from fastapi import (
     Request,
 )
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc, func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import asc, desc, func, tuple_
+from sqlalchemy.dialects.mysql import match
 
 from database import get_db
 from models import WorkExperiences, Users
@@ -28,6 +32,23 @@ router = APIRouter(
     dependencies=[Depends(get_current_user)],
 )
 
+
+def _decode_cursor(cursor: str):
+    """Decode a base64 "created_at:id" keyset cursor; 400 on garbage."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        ts, _, last_id = raw.rpartition(":")
+        return datetime.datetime.fromisoformat(ts), int(last_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _encode_cursor(row) -> str:
+    return base64.urlsafe_b64encode(
+        f"{row.created_at.isoformat()}:{row.id}".encode()
+    ).decode()
+
+
 # ------------------------------------------------------------------------
 # GET /work-experiences: list with pagination and embedded user
 # ------------------------------------------------------------------------
@@ -53,34 +74,64 @@ def list_work_experiences(
         regex="^(asc|desc)$",
         description="Sort direction",
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from next_cursor; overrides page and "
+                    "pins the sort to (created_at, id)",
+    ),
 ) -> WorkExperienceListResponse:
-    # 1) Total count
-    total = db.query(func.count(WorkExperiences.id)).scalar()
-
-    # 2) Base query + optional search
-    query = db.query(WorkExperiences)
+    # 1+2) Base query + optional search. COUNT(*) OVER () rides along with
+    # the page rows, so the total comes back in the same round trip and —
+    # being computed after WHERE — honours the search filter, which the old
+    # standalone count did not.
+    query = db.query(
+        WorkExperiences, func.count().over().label("total")
+    ).options(selectinload(WorkExperiences.user))
     if search:
-        term = f"%{search.strip()}%"
+        # MATCH ... AGAINST over the FULLTEXT index instead of a pair of
+        # leading-wildcard ILIKEs, which can never use an index
         query = query.filter(
-            WorkExperiences.company.ilike(term) |
-            WorkExperiences.job_title.ilike(term)
+            match(
+                WorkExperiences.company,
+                WorkExperiences.job_title,
+                against=search.strip(),
+            )
         )
 
-    # 3) Ordering
+    # 3+4) Ordering and pagination. With a cursor, seek past the last-seen
+    # (created_at, id) through the composite index instead of counting and
+    # discarding OFFSET rows.
     direction = asc if order == "asc" else desc
-    column = getattr(WorkExperiences, sort_by)
-    query = query.order_by(direction(column))
+    if cursor is not None:
+        last_created, last_id = _decode_cursor(cursor)
+        key = tuple_(WorkExperiences.created_at, WorkExperiences.id)
+        query = query.filter(
+            key > (last_created, last_id)
+            if order == "asc"
+            else key < (last_created, last_id)
+        ).order_by(
+            direction(WorkExperiences.created_at),
+            direction(WorkExperiences.id),
+        )
+        offset = 0
+        rows = query.limit(page_size).all()
+    else:
+        # id tiebreaker: created_at has second precision, so ties are routine
+        # and the keyset cursor needs a total order to resume from
+        column = getattr(WorkExperiences, sort_by)
+        query = query.order_by(direction(column), direction(WorkExperiences.id))
+        offset = (page - 1) * page_size
+        rows = query.offset(offset).limit(page_size).all()
+        if not rows and page != 1:
+            raise HTTPException(status_code=404, detail="Page out of range")
 
-    # 4) Pagination
-    offset = (page - 1) * page_size
-    raw_items = query.offset(offset).limit(page_size).all()
-    if not raw_items and page != 1:
-        raise HTTPException(status_code=404, detail="Page out of range")
+    total = rows[0].total if rows else 0
+    raw_items = [row[0] for row in rows]
 
-    # 5) Build items including nested user
+    # 5) Build items including nested user (eager-loaded above)
     items = []
     for exp in raw_items:
-        user = db.query(Users).get(exp.user_id) if exp.user_id else None
+        user = exp.user
         if not user:
             continue  # or raise if required
         items.append(
@@ -98,12 +149,24 @@ def list_work_experiences(
             )
         )
 
-    # 6) Navigation URLs
-    def make_url(p: int) -> str:
-        return str(request.url.include_query_params(page=p, page_size=page_size))
+    # 6) Navigation URLs — render the invariant part of the query string
+    # once (urlencode percent-escapes user input such as search), then each
+    # link is a plain f-string concat
+    path_url = str(request.url.replace(query=""))
+    suffix = urlencode({
+        k: v for k, v in request.query_params.items()
+        if k not in ("page", "page_size")
+    })
+    suffix = f"&{suffix}" if suffix else ""
 
-    prev_page = make_url(page - 1) if page > 1 else None
-    next_page = make_url(page + 1) if offset + len(items) < total else None
+    prev_page = (
+        f"{path_url}?page={page - 1}&page_size={page_size}{suffix}"
+        if page > 1 else None
+    )
+    next_page = (
+        f"{path_url}?page={page + 1}&page_size={page_size}{suffix}"
+        if offset + len(items) < total else None
+    )
 
     return WorkExperienceListResponse(
         total=total,
@@ -111,6 +174,10 @@ def list_work_experiences(
         page_size=page_size,
         next_page=next_page,
         prev_page=prev_page,
+        # only meaningful when the page ordering matches the keyset key
+        next_cursor=_encode_cursor(raw_items[-1])
+        if len(raw_items) == page_size and (cursor is not None or sort_by == "created_at")
+        else None,
         items=items,
     )
 
@@ -127,41 +194,33 @@ def add_work_experience(
     db: Session = Depends(get_db),
 ):
     # 1) Verify user exists
-    user = db.query(Users).get(data.user_id)
+    user = db.get(Users, data.user_id)
     if not user:
         raise HTTPException(
             status_code=400,
             detail={"error": "invalid_user", "message": f"No user found with ID {data.user_id}."}
         )
 
-    # 2) Prevent exact duplicate (company + user + start_date)
-    existing = (
-        db.query(WorkExperiences)
-        .filter_by(
-            company=data.company.strip(),
-            user_id=data.user_id,
-            start_date=data.start_date
-        )
-        .first()
-    )
-    if existing:
-        raise HTTPException(
-            status_code=400,
-            detail={"error": "experience_exists", "message": "This work experience already exists."}
-        )
-
-    # 3) Create and persist
+    # 2+3) Create and persist — the unique (user_id, company, start_date)
+    # index is the duplicate check, so no racy SELECT-then-INSERT
     new_exp = WorkExperiences(
-        company=data.company.strip(),
-        employer=data.employer.strip(),
-        job_title=data.job_title.strip(),
-        job_description=data.job_description.strip(),
+        company=data.company,
+        employer=data.employer,
+        job_title=data.job_title,
+        job_description=data.job_description,
         start_date=data.start_date,
         end_date=data.end_date,
         user_id=data.user_id,
     )
     db.add(new_exp)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "experience_exists", "message": "This work experience already exists."}
+        )
     db.refresh(new_exp)
 
     # 4) Return with nested user
@@ -190,13 +249,15 @@ def get_work_experience(
     exp_id: int,
     db: Session = Depends(get_db),
 ):
-    exp = db.query(WorkExperiences).get(exp_id)
+    exp = db.get(
+        WorkExperiences, exp_id, options=[selectinload(WorkExperiences.user)]
+    )
     if not exp:
         raise HTTPException(
             status_code=404,
             detail={"error": "not_found", "message": f"No experience found with ID {exp_id}."}
         )
-    user = db.query(Users).get(exp.user_id) if exp.user_id else None
+    user = exp.user
     return WorkExperienceSchema(
         id=exp.id,
         company=exp.company,
@@ -223,13 +284,13 @@ def update_work_experience(
     data: CreateWorkExperienceSchema,
     db: Session = Depends(get_db),
 ):
-    exp = db.query(WorkExperiences).get(exp_id)
+    exp = db.get(WorkExperiences, exp_id)
     if not exp:
         raise HTTPException(
             status_code=404,
             detail={"error": "not_found", "message": f"No experience found with ID {exp_id}."}
         )
-    user = db.query(Users).get(data.user_id)
+    user = db.get(Users, data.user_id)
     if not user:
         raise HTTPException(
             status_code=400,
@@ -241,7 +302,7 @@ def update_work_experience(
         db.query(WorkExperiences)
         .filter(
             WorkExperiences.id != exp_id,
-            WorkExperiences.company == data.company.strip(),
+            WorkExperiences.company == data.company,
             WorkExperiences.user_id == data.user_id,
             WorkExperiences.start_date == data.start_date,
         )
@@ -254,10 +315,10 @@ def update_work_experience(
         )
 
     # Apply updates
-    exp.company = data.company.strip()
-    exp.employer = data.employer.strip()
-    exp.job_title = data.job_title.strip()
-    exp.job_description = data.job_description.strip()
+    exp.company = data.company
+    exp.employer = data.employer
+    exp.job_title = data.job_title
+    exp.job_description = data.job_description
     exp.start_date = data.start_date
     exp.end_date = data.end_date
     exp.user_id = data.user_id
@@ -291,7 +352,7 @@ def delete_work_experience(
     exp_id: int,
     db: Session = Depends(get_db),
 ):
-    exp = db.query(WorkExperiences).get(exp_id)
+    exp = db.get(WorkExperiences, exp_id)
     if not exp:
         raise HTTPException(
             status_code=404,
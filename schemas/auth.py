@@ -1,10 +1,29 @@
 """
 Combined schema definitions for authentication and OTP-driven registration.
 """
-import re
 import datetime
-from typing import Optional
-from pydantic import BaseModel, EmailStr, Field, validator
+from typing import Annotated, Optional
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    StringConstraints,
+    field_validator,
+    model_validator,
+)
+
+# E.164 phone shape shared by registration and profile updates; the
+# pattern runs inside pydantic-core rather than a Python validator.
+PhoneNumber = Annotated[str, StringConstraints(pattern=r"^\+?[1-9]\d{1,14}$")]
+
+
+def _password_strength(v: str) -> str:
+    """Shared password rule: must mix letters and digits."""
+    if v.isdigit() or v.isalpha():
+        raise ValueError("Password must contain both letters and numbers")
+    return v
+
 
 # ----------------------------------------
 # Login User
@@ -37,14 +56,7 @@ class UserResponseSchema(BaseModel):
 class RegistrationInitiateSchema(BaseModel):
     student_id: int = Field(..., gt=0, description="Existing student ID from Students table")
     email: EmailStr = Field(..., description="Valid email address")
-    phone_number: str = Field(..., description="Phone number in international format, e.g. +250788123456")
-
-    @validator("phone_number")
-    def valid_phone(cls, v):
-        pattern = re.compile(r"^\+?[1-9]\d{1,14}$")
-        if not pattern.match(v):
-            raise ValueError("Invalid phone number format")
-        return v
+    phone_number: PhoneNumber = Field(..., description="Phone number in international format, e.g. +250788123456")
 
 
 # ----------------------------------------
@@ -57,18 +69,15 @@ class RegistrationCompleteSchema(BaseModel):
     password: str = Field(..., min_length=8, description="Password (min 8 characters)")
     confirm_password: str = Field(..., min_length=8, description="Password confirmation")
 
-    @validator("password")
+    @field_validator("password")
     def password_strength(cls, v):
-        if v.isdigit() or v.isalpha():
-            raise ValueError("Password must contain both letters and numbers")
-        return v
-
-    @validator("confirm_password")
-    def passwords_match(cls, v, values):
-        pwd = values.get("password")
-        if pwd and v != pwd:
+        return _password_strength(v)
+
+    @model_validator(mode="after")
+    def passwords_match(self):
+        if self.password != self.confirm_password:
             raise ValueError("Passwords do not match")
-        return v
+        return self
 
 
 # ----------------------------------------
@@ -77,21 +86,12 @@ class RegistrationCompleteSchema(BaseModel):
 class UserRegisterSchema(BaseModel):
     student_id: int = Field(..., gt=0, description="Existing student ID from Students table")
     email: EmailStr = Field(..., description="Valid email address")
-    phone_number: str = Field(..., description="Phone number in international format, e.g. +250788123456")
+    phone_number: PhoneNumber = Field(..., description="Phone number in international format, e.g. +250788123456")
     password: str = Field(..., min_length=8, description="Password (min 8 characters)")
 
-    @validator("password")
+    @field_validator("password")
     def password_strength(cls, v):
-        if v.isdigit() or v.isalpha():
-            raise ValueError("Password must contain both letters and numbers")
-        return v
-
-    @validator("phone_number")
-    def valid_phone(cls, v):
-        pattern = re.compile(r"^\+?[1-9]\d{1,14}$")
-        if not pattern.match(v):
-            raise ValueError("Invalid phone number format")
-        return v
+        return _password_strength(v)
 
 
 class PersonalInformationResponseSchema(BaseModel):
@@ -136,7 +136,7 @@ class LogoutResponse(BaseModel):
 class UpdateProfileSchema(BaseModel):
     # --- Account fields ---
     email: Optional[EmailStr] = Field(None, description="New email address")
-    phone_number: Optional[str] = Field(
+    phone_number: Optional[PhoneNumber] = Field(
         None, description="New phone number in international format"
     )
 
@@ -158,23 +158,14 @@ class UpdateProfileSchema(BaseModel):
     gender: Optional[bool] = Field(None, description="Gender: true for male, false for female")
     status: Optional[str] = Field(None, description="Current status info")
 
-    @validator("phone_number")
-    def validate_phone(cls, v):
-        if v is None:
-            return v
-        if not re.match(r"^\+?[1-9]\d{1,14}$", v):
-            raise ValueError("Invalid phone number format")
-        return v
-
-    @validator("end_date")
-    def check_dates(cls, v, values):
-        start = values.get("start_date")
-        if v and start and v < start:
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.end_date and self.start_date and self.end_date < self.start_date:
             raise ValueError("end_date cannot be earlier than start_date")
-        return v
+        return self
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "email": "jane.doe@example.com",
                 "phone_number": "+250788123456",
@@ -193,4 +184,5 @@ class UpdateProfileSchema(BaseModel):
                 "gender": True,
                 "status": "Active"
             }
-        }
\ No newline at end of file
+        }
+    )
@@ -11,7 +11,8 @@ class CreateCertificationSchema(BaseModel):
     year: int = Field(..., ge=1900, le=datetime.date.today().year, description="Year obtained")
     type: str = Field(..., min_length=3, description="Certification type or category")
     description: str = Field(..., min_length=10, description="Detailed description")
-    image: bytes = Field(..., description="Binary image data for the certificate")
+    # The image travels as a multipart UploadFile on the route, not as a
+    # bytes field — keeping it here would buffer the whole payload in memory
 
 # ----------------------------------------
 # Nested User DTO
@@ -65,6 +65,7 @@ class PersonalInformationListResponse(BaseModel):
     page_size: int
     next_page: Optional[str]
     prev_page: Optional[str]
+    next_cursor: Optional[str] = None
     items: List[PersonalInformationSchema]
 
     model_config = {"from_attributes": True}
@@ -35,6 +35,7 @@ class ProfessionListResponse(BaseModel):
     page_size: int
     next_page: Optional[str]
     prev_page: Optional[str]
+    next_cursor: Optional[str] = None
     items: List[ProfessionSchema]
 
     model_config = {"from_attributes": True}
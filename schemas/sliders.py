@@ -36,6 +36,7 @@ class SliderListResponse(BaseModel):
     page_size: int
     next_page: Optional[str]
     prev_page: Optional[str]
+    next_cursor: Optional[str] = None
     items: List[SliderSchema]
 
     model_config = {"from_attributes": True}
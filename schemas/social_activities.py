@@ -46,6 +46,7 @@ class SocialActivityListResponse(BaseModel):
     page_size: int
     next_page: Optional[str]
     prev_page: Optional[str]
+    next_cursor: Optional[str] = None
     items: List[SocialActivitySchema]
 
     model_config = {
@@ -17,6 +17,7 @@ class StudentListResponse(BaseModel):
     page_size: int
     next_page: Optional[str]
     prev_page: Optional[str]
+    next_cursor: Optional[str] = None
     items: List[StudentSchema]
 
     model_config = {
@@ -1,28 +1,26 @@
 import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field, validator, PositiveInt
+from typing import Annotated, List, Optional
+from pydantic import BaseModel, Field, PositiveInt, StringConstraints
 
 from schemas.auth import UserResponseSchema
 
+# Trimmed in pydantic-core at parse time; min_length runs after the strip,
+# so whitespace-only input fails validation and handlers never re-strip.
+_TrimmedStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=2)]
+_TrimmedText = Annotated[str, StringConstraints(strip_whitespace=True, min_length=10)]
+
 # ----------------------------------------
 # Schema for creating a Work Experience
 # ----------------------------------------
 class CreateWorkExperienceSchema(BaseModel):
-    company: str = Field(..., min_length=2, description="Company name")
-    employer: str = Field(..., min_length=2, description="Employer/manager name")
-    job_title: str = Field(..., min_length=2, description="Job title")
-    job_description: str = Field(..., min_length=10, description="Job description")
+    company: _TrimmedStr = Field(..., description="Company name")
+    employer: _TrimmedStr = Field(..., description="Employer/manager name")
+    job_title: _TrimmedStr = Field(..., description="Job title")
+    job_description: _TrimmedText = Field(..., description="Job description")
     start_date: datetime.date = Field(..., description="Start date")
     end_date: Optional[str] = Field(None, description="End date or ongoing")
     user_id: PositiveInt = Field(..., description="ID of the user this experience belongs to")
 
-    @validator("company", "employer", "job_title", "job_description")
-    def not_blank(cls, v: str) -> str:
-        v = v.strip()
-        if not v:
-            raise ValueError("Field must not be blank")
-        return v
-
 # ----------------------------------------
 # Schema for returning a single Work Experience
 # ----------------------------------------
@@ -49,6 +47,7 @@ class WorkExperienceListResponse(BaseModel):
     page_size: int
     next_page: Optional[str]
     prev_page: Optional[str]
+    next_cursor: Optional[str] = None
     items: List[WorkExperienceSchema]
 
     model_config = {"from_attributes": True}
@@ -0,0 +1,27 @@
+import time
+from typing import Any, Callable
+
+# key -> (expires_at, value)
+_store = {}
+
+
+def get_cached(key: str, ttl: float, loader: Callable[[], Any]) -> Any:
+    """
+    Return the cached value for `key`, calling `loader` on a miss or after
+    `ttl` seconds. Per-process dict — fine for cheap derived values like
+    list totals; anything that must be shared across workers belongs in an
+    external cache.
+    """
+    now = time.monotonic()
+    hit = _store.get(key)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    value = loader()
+    _store[key] = (now + ttl, value)
+    return value
+
+
+def invalidate(prefix: str) -> None:
+    """Drop every cached entry whose key starts with `prefix`."""
+    for key in [k for k in _store if k.startswith(prefix)]:
+        _store.pop(key, None)
@@ -0,0 +1,16 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+# Dedicated pool for Pillow/libvips work. A handful of long-lived workers
+# keeps codec state and coefficient tables cache-warm across bursts of
+# uploads, and stops image jobs from exhausting the shared request
+# threadpool. The SIMD resize kernels release the GIL, so the workers
+# genuinely run in parallel.
+IMAGE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="img")
+
+
+async def run_image_task(fn, *args, **kwargs):
+    """Run CPU-bound image work on the dedicated pool and await the result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(IMAGE_POOL, partial(fn, *args, **kwargs))